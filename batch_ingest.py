@@ -0,0 +1,59 @@
+"""
+YECC Resume Parser - Batch Ingestion CLI
+Run with: python batch_ingest.py <files, folders or .zip archives> [--no-sync] [--no-llm] [--output report.json]
+"""
+import argparse
+import json
+import os
+from src.services import batch_service
+from src.utils import allowed_file
+
+
+def collect_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if allowed_file(name) or name.lower().endswith('.zip'):
+                        files.extend(read_file(os.path.join(root, name)))
+        else:
+            files.extend(read_file(path))
+    return files
+
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return batch_service.expand_upload(os.path.basename(path), f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a folder or archive of resumes in one batch")
+    parser.add_argument('paths', nargs='+', help="Resume files, folders or .zip archives")
+    parser.add_argument('--no-sync', action='store_true', help="Skip syncing candidates to YECC")
+    parser.add_argument('--no-llm', action='store_true', help="Pre-screen with rule-based extraction only, without LLM calls")
+    parser.add_argument('--output', help="Write the per-file report as JSON to this path")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    if not files:
+        print("⚠️ No resumes found.")
+        return
+
+    report = batch_service.ingest(files, sync=not args.no_sync, use_llm=False if args.no_llm else None)
+    for result in report['results']:
+        status = "✅" if result['success'] else "❌"
+        detail = f"ID {result['resume_id']}" if result['success'] else result.get('error', '')
+        print(f"{status} {result['filename']}: {detail}")
+    for filename in report['dropped']:
+        print(f"⏭️ {filename}: dropped, over the batch file limit")
+    print(f"\n{report['succeeded']}/{report['total']} succeeded in {report['elapsed_seconds']}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
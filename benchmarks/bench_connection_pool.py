@@ -0,0 +1,62 @@
+"""
+Per-call latency of a fresh psycopg2.connect() versus a pooled checkout.
+Run with: DATABASE_URL=postgres://... python -m benchmarks.bench_connection_pool [iterations]
+"""
+import statistics
+import sys
+import time
+import psycopg2
+from src.config import config
+from src.repositories.connection_pool import ConnectionPool
+
+
+def run_fresh(iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        conn = psycopg2.connect(config.DATABASE_URL)
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM resumes')
+        cursor.fetchone()
+        conn.close()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def run_pooled(iterations):
+    pool = ConnectionPool()
+    with pool.connection():
+        pass
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM resumes')
+            cursor.fetchone()
+        timings.append((time.perf_counter() - started) * 1000)
+    pool.close()
+    return timings
+
+
+def summarize(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<10} mean {statistics.mean(timings):8.2f} ms   p50 {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main():
+    if not config.DATABASE_URL:
+        print("DATABASE_URL environment variable is required")
+        sys.exit(1)
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"Running {iterations} calls per mode against {config.DATABASE_URL.split('@')[-1]}\n")
+    fresh = run_fresh(iterations)
+    pooled = run_pooled(iterations)
+    summarize("fresh", fresh)
+    summarize("pooled", pooled)
+    print(f"\nSpeedup: {statistics.mean(fresh) / statistics.mean(pooled):.1f}x per call")
+
+
+if __name__ == '__main__':
+    main()
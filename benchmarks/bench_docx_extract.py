@@ -0,0 +1,67 @@
+"""
+Speed and peak Python memory of the streaming DOCX extractor versus the python-docx
+object model. Without a path, a synthetic resume with a skills table is generated.
+Run with: python -m benchmarks.bench_docx_extract [path/to/docx] [repeats]
+"""
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from docx import Document
+from src.utils.docx_extractor import extract_docx_text
+
+
+def python_docx_text(source):
+    doc = Document(source)
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
+
+
+def synthetic_resume(paragraphs=400, rows=60):
+    doc = Document()
+    doc.add_heading('Jane Doe - SAP FICO Consultant', 0)
+    for i in range(paragraphs):
+        doc.add_paragraph(f'Project {i}: Implemented S/4HANA Finance, GL, AP, AR and asset accounting for client {i}.')
+    table = doc.add_table(rows=rows, cols=3)
+    for i, row in enumerate(table.rows):
+        row.cells[0].text = f'Module {i}'
+        row.cells[1].text = 'FI/CO'
+        row.cells[2].text = f'{i % 10} years'
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def load_corpus(root):
+    root = Path(root)
+    paths = [root] if root.is_file() else sorted(root.rglob('*.docx'))
+    return [path.read_bytes() for path in paths]
+
+
+def measure(label, extract, corpus, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for data in corpus:
+            extract(io.BytesIO(data))
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    chars = sum(len(extract(io.BytesIO(data))) for data in corpus)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    docs = len(corpus) * repeats
+    print(f"{label:<12} {elapsed / docs * 1000:8.2f} ms/doc   peak {peak / 1024:9.1f} KiB   {chars} chars")
+
+
+def main():
+    corpus = load_corpus(sys.argv[1]) if len(sys.argv) > 1 else [synthetic_resume()]
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    if not corpus:
+        print("No DOCX files found")
+        sys.exit(1)
+    print(f"Corpus: {len(corpus)} documents, {repeats} repeats\n")
+    measure("python-docx", python_docx_text, corpus, repeats)
+    measure("streaming", extract_docx_text, corpus, repeats)
+
+
+if __name__ == '__main__':
+    main()
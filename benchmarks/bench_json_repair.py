@@ -0,0 +1,85 @@
+"""
+Recovery rate and speed of the JSON repair parser against the old brace-append approach,
+over a corpus of malformed LLM responses. Each fixture's repaired output is checked
+against its .expected.json file, so a mismatch exits non-zero.
+Run with: python -m benchmarks.bench_json_repair [fixtures/dir] [repeats]
+"""
+import json
+import sys
+import time
+from pathlib import Path
+from src.utils.json_repair import repair_json, strip_wrappers
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'malformed_json'
+
+
+def legacy_parse(content):
+    content = strip_wrappers(content)
+    start = content.find('{')
+    end = content.rfind('}')
+    if start == -1 or end == -1 or end <= start:
+        raise json.JSONDecodeError("No JSON found", content, 0)
+    json_str = content[start:end+1]
+    if json_str.count('{') > json_str.count('}'):
+        json_str += '}' * (json_str.count('{') - json_str.count('}'))
+    if json_str.count('[') > json_str.count(']'):
+        json_str += ']' * (json_str.count('[') - json_str.count(']'))
+    return json.loads(json_str)
+
+
+def repaired_parse(content):
+    return repair_json(strip_wrappers(content))[0]
+
+
+def load_corpus(root):
+    corpus = []
+    for path in sorted(Path(root).glob('*.txt')):
+        expected = path.with_suffix('.expected.json')
+        corpus.append((path.name, path.read_text(encoding='utf-8'), json.loads(expected.read_text(encoding='utf-8')) if expected.exists() else None))
+    return corpus
+
+
+def time_parser(parse, content, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        try:
+            parse(content)
+        except ValueError:
+            pass
+    return (time.perf_counter() - started) / repeats * 1e6
+
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else FIXTURES
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    corpus = load_corpus(root)
+    if not corpus:
+        print("No fixtures found")
+        sys.exit(1)
+    print(f"{'fixture':<36} {'legacy':>8} {'repair':>8} {'µs':>8}  repairs")
+    legacy_ok = 0
+    failures = []
+    for name, content, expected in corpus:
+        try:
+            legacy_parse(content)
+            legacy = 'ok'
+            legacy_ok += 1
+        except ValueError:
+            legacy = 'raise'
+        try:
+            parsed, repairs = repair_json(strip_wrappers(content))
+            status = 'ok' if expected is None or parsed == expected else 'MISMATCH'
+        except ValueError as e:
+            parsed, repairs, status = None, [str(e)], 'raise'
+        if status != 'ok':
+            failures.append(name)
+        elapsed = time_parser(repaired_parse, content, repeats)
+        print(f"{name:<36} {legacy:>8} {status:>8} {elapsed:>8.1f}  {', '.join(repairs) or '-'}")
+    print(f"\nLegacy parser recovered {legacy_ok}/{len(corpus)}, repair parser {len(corpus) - len(failures)}/{len(corpus)}")
+    if failures:
+        print(f"Regressions: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
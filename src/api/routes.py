@@ -1,16 +1,21 @@
-import os
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, Response, render_template, request, jsonify, stream_with_context
 from werkzeug.utils import secure_filename
 
 from src.config import config
-from src.utils import allowed_file, extract_text
-from src.services import parser_service, search_service, sync_to_yecc_api
+from src.utils import allowed_file, pdf_extractor, extraction_sandbox
+from src.services import ai_service, llm_rate_limiter, parser_service, search_service, search_cache_service, job_service, batch_service, BatchTooLarge, yecc_client, yecc_outbox_dispatcher
 from src.repositories import resume_repository
 
 
 api = Blueprint('api', __name__)
 
 
+@api.before_app_request
+def start_background_workers():
+    job_service.start()
+    yecc_outbox_dispatcher.start()
+
+
 @api.route('/')
 def home():
     return render_template('Home.html')
@@ -40,61 +45,96 @@ def upload_resume():
             return jsonify({'success': False, 'error': 'Invalid file type'}), 400
         
         filename = secure_filename(file.filename)
-        filepath = os.path.join(config.UPLOAD_FOLDER, filename)
-        os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
-        file.save(filepath)
-        print(f"\n📄 File saved: {filepath}")
+        job_id = job_service.submit(filename, file.read())
         
-        try:
-            resume_text = extract_text(filepath, filename)
-            print(f"📝 Extracted {len(resume_text)} characters")
-            
-            if len(resume_text) < 50:
-                raise Exception("File appears empty or corrupted")
-        except Exception as e:
-            os.remove(filepath)
-            return jsonify({'success': False, 'error': f'Text extraction failed: {str(e)}'}), 500
+        return jsonify({
+            'success': True,
+            'message': 'Resume queued for processing',
+            'job_id': job_id,
+            'status_url': f'/jobs/{job_id}',
+            'events_url': f'/jobs/{job_id}/events'
+        }), 202
         
-        try:
-            parsed_data = parser_service.parse(resume_text, filename)
-            
-            if not parsed_data:
-                raise Exception('No data returned from AI')
-            
-            parsed_data = parser_service.enhance(parsed_data, resume_text)
-            print("✅ Data enhanced with post-processing")
-            
-            completeness_score = parser_service.score_completeness(parsed_data)
-            print(f"📊 Resume completeness: {completeness_score}%")
-            parsed_data['_completeness_score'] = completeness_score
-            
-            yecc_result = sync_to_yecc_api(parsed_data)
-            if yecc_result:
-                parsed_data['_yecc_user_id'] = yecc_result.get('user_id')
-                parsed_data['_yecc_resume_url'] = yecc_result.get('resume_url')
-                parsed_data['_yecc_profile_url'] = yecc_result.get('yecc_profile_url')
-                
-        except Exception as e:
-            os.remove(filepath)
-            return jsonify({'success': False, 'error': f'AI parsing failed: {str(e)}'}), 500
+    except Exception as e:
+        print(f"❌ Unexpected error: {str(e)}")
+        return jsonify({'success': False, 'error': f'Unexpected error: {str(e)}'}), 500
+
+
+@api.route('/upload/batch', methods=['POST'])
+def upload_batch():
+    try:
+        uploads = request.files.getlist('resumes') + request.files.getlist('archive')
+        if not uploads:
+            return jsonify({'success': False, 'error': 'No files uploaded'}), 400
+        
+        files = []
+        total = 0
+        for upload in uploads:
+            if upload.filename:
+                expanded = batch_service.expand_upload(upload.filename, upload.read(), config.BATCH_MAX_TOTAL_SIZE - total)
+                total += sum(len(file_bytes) for _, file_bytes in expanded)
+                files.extend(expanded)
         
-        try:
-            resume_repository.save(parsed_data)
-        except Exception as e:
-            os.remove(filepath)
-            return jsonify({'success': False, 'error': f'Database save failed: {str(e)}'}), 500
+        if not files:
+            return jsonify({'success': False, 'error': 'No valid resumes found'}), 400
         
-        os.remove(filepath)
+        sync = request.form.get('sync', 'true').lower() == 'true'
+        use_llm = request.form['llm'].lower() == 'true' if 'llm' in request.form else None
+        job_id, dropped = job_service.submit_batch(files, sync=sync, use_llm=use_llm)
         
         return jsonify({
             'success': True,
-            'message': 'Resume parsed and saved successfully',
-            'data': parsed_data
-        })
+            'message': 'Batch queued for processing',
+            'batch_id': job_id,
+            'queued': len(files) - len(dropped),
+            'dropped': dropped,
+            'status_url': f'/jobs/{job_id}',
+            'events_url': f'/jobs/{job_id}/events'
+        }), 202
+    except BatchTooLarge as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except Exception as e:
+        print(f"❌ Batch upload error: {str(e)}")
+        return jsonify({'success': False, 'error': f'Batch upload failed: {str(e)}'}), 500
+
+
+@api.route('/jobs/<job_id>')
+def get_job(job_id):
+    try:
+        job = job_service.get(job_id)
+        if not job:
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
         
+        return jsonify({'success': True, **job})
     except Exception as e:
-        print(f"❌ Unexpected error: {str(e)}")
-        return jsonify({'success': False, 'error': f'Unexpected error: {str(e)}'}), 500
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@api.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    try:
+        if not job_service.get(job_id):
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
+        
+        return Response(
+            stream_with_context(job_service.stream_events(job_id)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@api.route('/resumes/<int:resume_id>/sync')
+def get_sync_status(resume_id):
+    try:
+        status = yecc_outbox_dispatcher.get_status(resume_id)
+        if not status:
+            return jsonify({'success': False, 'error': 'No YECC sync queued for this resume'}), 404
+        
+        return jsonify({'success': True, **status})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @api.route('/search', methods=['POST'])
@@ -123,6 +163,18 @@ def search():
 def get_stats():
     try:
         count = resume_repository.count()
-        return jsonify({'success': True, 'count': count})
+        return jsonify({
+            'success': True,
+            'count': count,
+            'search_cache': search_cache_service.get_stats(),
+            'yecc_timings': yecc_client.get_stats(),
+            'yecc_outbox': yecc_outbox_dispatcher.get_counts(),
+            'pdf_engines': pdf_extractor.get_stats(),
+            'extraction_sandbox': extraction_sandbox.get_stats(),
+            'prompt_tokens': parser_service.get_prompt_stats(),
+            'llm_latency': ai_service.get_latency_stats(),
+            'llm_breakers': ai_service.get_breaker_stats(),
+            'llm_rate_limits': llm_rate_limiter.get_stats()
+        })
     except Exception as e:
         return jsonify({'success': False, 'count': 0, 'error': str(e)})
@@ -2,6 +2,7 @@ import os
 from flask import Flask
 from src.config import config
 from src.api import api
+from src.services import job_service, yecc_outbox_dispatcher
 def create_app():
     app = Flask(__name__, template_folder='../templates')
     app.config['UPLOAD_FOLDER'] = config.UPLOAD_FOLDER
@@ -9,6 +10,8 @@ def create_app():
     app.secret_key = config.SECRET_KEY
     os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
     app.register_blueprint(api)
+    job_service.start()
+    yecc_outbox_dispatcher.start()
     return app
 def run():
     print("\n" + "="*60)
@@ -6,18 +6,110 @@ class Config:
     DEBUG = os.getenv("FLASK_DEBUG", "True").lower() == "true"
     UPLOAD_FOLDER = "uploads"
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+    PDF_ENGINES = [name.strip() for name in os.getenv("PDF_ENGINES", "pypdf2,pdfplumber").split(",") if name.strip()]
+    PDF_MIN_CHARS_PER_PAGE = int(os.getenv("PDF_MIN_CHARS_PER_PAGE", "200"))
+    PDF_MAX_GARBLED_RATIO = float(os.getenv("PDF_MAX_GARBLED_RATIO", "0.01"))
+    PDF_MAX_AVG_WORD_LENGTH = float(os.getenv("PDF_MAX_AVG_WORD_LENGTH", "15"))
+    PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "30"))
+    PDF_PARALLEL_ENABLED = os.getenv("PDF_PARALLEL_ENABLED", "True").lower() == "true"
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+    PDF_PARALLEL_WORKERS = int(os.getenv("PDF_PARALLEL_WORKERS", str(min(4, os.cpu_count() or 1))))
+    EXTRACT_SANDBOX_ENABLED = os.getenv("EXTRACT_SANDBOX_ENABLED", "True").lower() == "true"
+    EXTRACT_SANDBOX_WORKERS = int(os.getenv("EXTRACT_SANDBOX_WORKERS", "0")) or os.cpu_count() or 2
+    EXTRACT_SANDBOX_MAX_DOCUMENTS = int(os.getenv("EXTRACT_SANDBOX_MAX_DOCUMENTS", "50"))
+    EXTRACT_SANDBOX_QUEUE_TIMEOUT = float(os.getenv("EXTRACT_SANDBOX_QUEUE_TIMEOUT", "120"))
+    EXTRACT_SANDBOX_POLL_INTERVAL = float(os.getenv("EXTRACT_SANDBOX_POLL_INTERVAL", "0.05"))
+    EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "60"))
+    EXTRACT_MAX_RSS_MB = int(os.getenv("EXTRACT_MAX_RSS_MB", "512"))
     ALLOWED_EXTENSIONS = {"pdf", "docx", "doc"}
     DATABASE_URL = os.getenv("DATABASE_URL")
     DATABASE_FILE = "resumes.db"
+    DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+    DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_HEALTHCHECK_IDLE = float(os.getenv("DB_POOL_HEALTHCHECK_IDLE", "30"))
+    SEARCH_RESULT_LIMIT = int(os.getenv("SEARCH_RESULT_LIMIT", "50"))
+    VECTOR_DIM = int(os.getenv("VECTOR_DIM", "1024"))
+    SEARCH_MIN_SIMILARITY = float(os.getenv("SEARCH_MIN_SIMILARITY", "0.05"))
+    SEARCH_RERANK_ENABLED = os.getenv("SEARCH_RERANK_ENABLED", "True").lower() == "true"
+    SEARCH_RERANK_TOP_N = int(os.getenv("SEARCH_RERANK_TOP_N", "30"))
+    SEARCH_RERANK_TOKEN_BUDGET = int(os.getenv("SEARCH_RERANK_TOKEN_BUDGET", "2000"))
+    SEARCH_RERANK_DEADLINE = float(os.getenv("SEARCH_RERANK_DEADLINE", "8"))
+    SEARCH_RERANK_WORKERS = int(os.getenv("SEARCH_RERANK_WORKERS", "4"))
+    SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "900"))
+    SEARCH_CACHE_SHARED = os.getenv("SEARCH_CACHE_SHARED", "False").lower() == "true"
+    PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "256"))
+    PARSE_CACHE_MAX_AGE_DAYS = int(os.getenv("PARSE_CACHE_MAX_AGE_DAYS", "30"))
+    PARSE_CACHE_EXPIRE_INTERVAL = int(os.getenv("PARSE_CACHE_EXPIRE_INTERVAL", "3600"))
+    PARSE_TOKEN_BUDGET = int(os.getenv("PARSE_TOKEN_BUDGET", "6000"))
+    PARSE_USE_LLM = os.getenv("PARSE_USE_LLM", "True").lower() == "true"
+    PARSE_STREAMING_ENABLED = os.getenv("PARSE_STREAMING_ENABLED", "True").lower() == "true"
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+    JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "600"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_EVENTS_POLL_INTERVAL = float(os.getenv("JOB_EVENTS_POLL_INTERVAL", "1"))
+    JOB_EVENTS_HEARTBEAT = float(os.getenv("JOB_EVENTS_HEARTBEAT", "10"))
+    JOB_EVENTS_WINDOW = float(os.getenv("JOB_EVENTS_WINDOW", "25"))
+    BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+    BATCH_MAX_TOTAL_SIZE = int(os.getenv("BATCH_MAX_TOTAL_SIZE", str(256 * 1024 * 1024)))
+    BATCH_MAX_ARCHIVE_MEMBERS = int(os.getenv("BATCH_MAX_ARCHIVE_MEMBERS", "2000"))
+    BATCH_EXTRACT_WORKERS = int(os.getenv("BATCH_EXTRACT_WORKERS", "0")) or os.cpu_count() or 2
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
     GEMINI_MODEL = "gemini-2.0-flash-exp"
     GROK_API_KEY = os.getenv("GROK_API_KEY")
     GROK_API_BASE = "https://openrouter.ai/api/v1"
     GROK_MODEL = "x-ai/grok-3-mini-beta"
+    GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+    GROK_MAX_CONCURRENCY = int(os.getenv("GROK_MAX_CONCURRENCY", "2"))
+    LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "256"))
+    LLM_RATE_LIMIT_SHARED = os.getenv("LLM_RATE_LIMIT_SHARED", "True").lower() == "true"
+    GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))
+    GEMINI_BURST = float(os.getenv("GEMINI_BURST", "10"))
+    GEMINI_GLOBAL_CONCURRENCY = int(os.getenv("GEMINI_GLOBAL_CONCURRENCY", "8"))
+    GROK_RPM = float(os.getenv("GROK_RPM", "60"))
+    GROK_BURST = float(os.getenv("GROK_BURST", "10"))
+    GROK_GLOBAL_CONCURRENCY = int(os.getenv("GROK_GLOBAL_CONCURRENCY", "8"))
+    LLM_LEASE_SECONDS = int(os.getenv("LLM_LEASE_SECONDS", "180"))
+    LLM_QUEUE_DEADLINE = float(os.getenv("LLM_QUEUE_DEADLINE", "30"))
+    LLM_QUEUE_POLL_INTERVAL = float(os.getenv("LLM_QUEUE_POLL_INTERVAL", "0.25"))
+    LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+    LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+    LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+    LLM_BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", "20"))
+    LLM_BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "5"))
+    LLM_BREAKER_ERROR_RATE = float(os.getenv("LLM_BREAKER_ERROR_RATE", "0.5"))
+    LLM_BREAKER_SLOW_SECONDS = float(os.getenv("LLM_BREAKER_SLOW_SECONDS", "60"))
+    LLM_BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+    PARSE_HEDGE_ENABLED = os.getenv("PARSE_HEDGE_ENABLED", "True").lower() == "true"
+    PARSE_HEDGE_PERCENTILE = float(os.getenv("PARSE_HEDGE_PERCENTILE", "90"))
+    PARSE_HEDGE_MIN_SAMPLES = int(os.getenv("PARSE_HEDGE_MIN_SAMPLES", "20"))
+    PARSE_HEDGE_DEFAULT_DELAY = float(os.getenv("PARSE_HEDGE_DEFAULT_DELAY", "10"))
+    PARSE_HEDGE_MIN_DELAY = float(os.getenv("PARSE_HEDGE_MIN_DELAY", "1"))
+    PARSE_HEDGE_WORKERS = int(os.getenv("PARSE_HEDGE_WORKERS", "0")) or 2 * (GEMINI_MAX_CONCURRENCY + GROK_MAX_CONCURRENCY)
     USE_BETA = True
     YECC_API_TOKEN = os.getenv("YECC_API_TOKEN")
     YECC_BASE_URL = "https://api.yecc.tech"
     YECC_FRONTEND_URL = "https://beta.yecc.tech" if USE_BETA else "https://yecc.tech"
+    YECC_CONNECT_TIMEOUT = float(os.getenv("YECC_CONNECT_TIMEOUT", "5"))
+    YECC_READ_TIMEOUT = float(os.getenv("YECC_READ_TIMEOUT", "30"))
+    YECC_POOL_SIZE = int(os.getenv("YECC_POOL_SIZE", "16"))
+    YECC_MAX_RETRIES = int(os.getenv("YECC_MAX_RETRIES", "3"))
+    YECC_BACKOFF_BASE = float(os.getenv("YECC_BACKOFF_BASE", "0.5"))
+    YECC_BACKOFF_MAX = float(os.getenv("YECC_BACKOFF_MAX", "8"))
+    YECC_SECTION_WORKERS = int(os.getenv("YECC_SECTION_WORKERS", "12"))
+    YECC_SYNC_DEADLINE = float(os.getenv("YECC_SYNC_DEADLINE", "45"))
+    YECC_OUTBOX_WORKERS = int(os.getenv("YECC_OUTBOX_WORKERS", "2"))
+    YECC_OUTBOX_POLL_INTERVAL = float(os.getenv("YECC_OUTBOX_POLL_INTERVAL", "5"))
+    YECC_OUTBOX_MAX_ATTEMPTS = int(os.getenv("YECC_OUTBOX_MAX_ATTEMPTS", "8"))
+    YECC_OUTBOX_BACKOFF_BASE = float(os.getenv("YECC_OUTBOX_BACKOFF_BASE", "30"))
+    YECC_OUTBOX_BACKOFF_MAX = float(os.getenv("YECC_OUTBOX_BACKOFF_MAX", "3600"))
+    YECC_OUTBOX_STALE_SECONDS = int(os.getenv("YECC_OUTBOX_STALE_SECONDS", "900"))
+    YECC_CATALOG_TTL = int(os.getenv("YECC_CATALOG_TTL", "3600"))
+    YECC_CATALOG_RETRY_AFTER = int(os.getenv("YECC_CATALOG_RETRY_AFTER", "60"))
+    YECC_CATALOG_MEMO_SIZE = int(os.getenv("YECC_CATALOG_MEMO_SIZE", "1024"))
+    YECC_CATALOG_DIR = os.getenv("YECC_CATALOG_DIR", os.path.join("cache", "yecc_catalogs"))
     @classmethod
     def get_yecc_headers(cls):
         return {
@@ -1 +1,8 @@
+from .connection_pool import ConnectionPool, db_pool
 from .resume_repository import ResumeRepository, resume_repository
+from .parse_cache_repository import ParseCacheRepository, parse_cache_repository
+from .job_repository import JobRepository, job_repository
+from .search_cache_repository import SearchCacheRepository, search_cache_repository
+from .outbox_repository import OutboxRepository, outbox_repository
+from .yecc_identity_repository import YeccIdentityRepository, yecc_identity_repository
+from .rate_limit_repository import RateLimitRepository, rate_limit_repository
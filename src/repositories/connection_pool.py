@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from psycopg2 import extensions
+from psycopg2.pool import ThreadedConnectionPool
+from src.config import config
+class ConnectionPool:
+    def __init__(self, database_url=None, minconn=None, maxconn=None):
+        self.database_url = database_url or config.DATABASE_URL
+        self.minconn = minconn or config.DB_POOL_MIN
+        self.maxconn = maxconn or config.DB_POOL_MAX
+        self._pool = None
+        self._pid = None
+        self._slots = None
+        self._last_used = {}
+        self._inherited = []
+        self._lock = threading.Lock()
+    def _get_pool(self):
+        pid = os.getpid()
+        if self._pool is None or self._pid != pid:
+            with self._lock:
+                if self._pool is None or self._pid != pid:
+                    if self._pid is not None and self._pid != pid:
+                        # Keep the parent's pool referenced so its sockets are never closed from the child
+                        self._inherited.append(self._pool)
+                        print(f"🔁 Recreating database pool after fork (PID {pid})")
+                    self._pool = ThreadedConnectionPool(self.minconn, self.maxconn, self.database_url)
+                    self._slots = threading.BoundedSemaphore(self.maxconn)
+                    self._last_used = {}
+                    self._pid = pid
+        return self._pool
+    def _is_healthy(self, conn):
+        if conn.closed or conn.info.transaction_status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if time.time() - self._last_used.get(id(conn), 0) < config.DB_POOL_HEALTHCHECK_IDLE:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+    def _checkout(self, pool):
+        for _ in range(self.maxconn):
+            conn = pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+            print("⚠️ Discarding broken database connection")
+            self._last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+        return pool.getconn()
+    @contextmanager
+    def connection(self):
+        pool = self._get_pool()
+        slots = self._slots
+        if not slots.acquire(timeout=config.DB_POOL_TIMEOUT):
+            raise Exception("Timed out waiting for a database connection")
+        try:
+            conn = self._checkout(pool)
+            try:
+                yield conn
+            except Exception:
+                if not conn.closed:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                raise
+            finally:
+                self._last_used[id(conn)] = time.time()
+                pool.putconn(conn)
+        finally:
+            slots.release()
+    def close(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.closeall()
+            self._pool = None
+            self._pid = None
+db_pool = ConnectionPool()
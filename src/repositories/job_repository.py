@@ -0,0 +1,142 @@
+import json
+import uuid
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from src.config import config
+from src.repositories.connection_pool import db_pool
+class JobRepository:
+    def __init__(self, pool=None):
+        self.database_url = config.DATABASE_URL
+        if not self.database_url:
+            raise Exception("DATABASE_URL environment variable is required")
+        self.pool = pool or db_pool
+        self._init_database()
+    def _init_database(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS upload_jobs (
+                    id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    file_data BYTEA,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    stages TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER DEFAULT 0,
+                    locked_at TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('ALTER TABLE upload_jobs ADD COLUMN IF NOT EXISTS partial TEXT')
+            cursor.execute("ALTER TABLE upload_jobs ADD COLUMN IF NOT EXISTS kind TEXT NOT NULL DEFAULT 'upload'")
+            cursor.execute('ALTER TABLE upload_jobs ADD COLUMN IF NOT EXISTS options TEXT')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_upload_jobs_status ON upload_jobs(status, created_at)')
+            conn.commit()
+    def enqueue(self, filename, file_bytes, stages, kind='upload', options=None):
+        job_id = uuid.uuid4().hex
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO upload_jobs (id, filename, file_data, stages, kind, options)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            ''', (job_id, filename, psycopg2.Binary(file_bytes), json.dumps(stages), kind, json.dumps(options or {})))
+            conn.commit()
+        return job_id
+    def claim_next(self, stale_seconds, max_attempts):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute('''
+                UPDATE upload_jobs SET error = 'Exceeded maximum attempts', status = 'failed',
+                    file_data = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'running' AND attempts >= %s
+                  AND locked_at < CURRENT_TIMESTAMP - make_interval(secs => %s)
+            ''', (max_attempts, stale_seconds))
+            cursor.execute('''
+                SELECT id FROM upload_jobs
+                WHERE status = 'queued'
+                   OR (status = 'running' AND locked_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+                ORDER BY created_at
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            ''', (stale_seconds,))
+            row = cursor.fetchone()
+            if not row:
+                conn.commit()
+                return None
+            cursor.execute('''
+                UPDATE upload_jobs SET status = 'running', attempts = attempts + 1,
+                    locked_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+                RETURNING id, filename, file_data, stages, attempts, kind, options
+            ''', (row['id'],))
+            job = cursor.fetchone()
+            conn.commit()
+        return {
+            'id': job['id'],
+            'filename': job['filename'],
+            'file_data': bytes(job['file_data']),
+            'stages': json.loads(job['stages'] or '{}'),
+            'attempts': job['attempts'],
+            'kind': job['kind'],
+            'options': json.loads(job['options'] or '{}')
+        }
+    def update_stages(self, job_id, stages):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE upload_jobs SET stages = %s, locked_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            ''', (json.dumps(stages), job_id))
+            conn.commit()
+    def update_partial(self, job_id, partial):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE upload_jobs SET partial = %s, locked_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            ''', (json.dumps(partial), job_id))
+            conn.commit()
+    def complete(self, job_id, result):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE upload_jobs SET status = 'completed', result = %s, file_data = NULL,
+                    locked_at = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            ''', (json.dumps(result), job_id))
+            conn.commit()
+    def fail(self, job_id, error):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE upload_jobs SET status = 'failed', error = %s, file_data = NULL,
+                    locked_at = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            ''', (error, job_id))
+            conn.commit()
+    def get(self, job_id):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute('''
+                SELECT id, filename, kind, status, stages, partial, result, error, attempts, created_at, updated_at
+                FROM upload_jobs WHERE id = %s
+            ''', (job_id,))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return {
+            'job_id': row['id'],
+            'filename': row['filename'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'stages': json.loads(row['stages'] or '{}'),
+            'partial': json.loads(row['partial'] or '{}'),
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'created_at': row['created_at'].isoformat() if row['created_at'] else None,
+            'updated_at': row['updated_at'].isoformat() if row['updated_at'] else None
+        }
+job_repository = JobRepository()
@@ -0,0 +1,99 @@
+import json
+import random
+from psycopg2.extras import RealDictCursor
+from src.config import config
+from src.repositories.connection_pool import db_pool
+from src.repositories.resume_repository import resume_repository
+class OutboxRepository:
+    def __init__(self, pool=None, resumes=None):
+        self.database_url = config.DATABASE_URL
+        if not self.database_url:
+            raise Exception("DATABASE_URL environment variable is required")
+        self.pool = pool or db_pool
+        self.resumes = resumes or resume_repository
+    def claim_next(self, stale_seconds):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute('''
+                SELECT id FROM yecc_outbox
+                WHERE (status = 'pending' AND next_attempt_at <= CURRENT_TIMESTAMP)
+                   OR (status = 'processing' AND locked_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+                ORDER BY next_attempt_at
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            ''', (stale_seconds,))
+            row = cursor.fetchone()
+            if not row:
+                conn.commit()
+                return None
+            cursor.execute('''
+                UPDATE yecc_outbox SET status = 'processing', attempts = attempts + 1,
+                    locked_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+                RETURNING id, resume_id, payload, attempts
+            ''', (row['id'],))
+            entry = cursor.fetchone()
+            conn.commit()
+        return {
+            'id': entry['id'],
+            'resume_id': entry['resume_id'],
+            'payload': json.loads(entry['payload']),
+            'attempts': entry['attempts']
+        }
+    def complete(self, entry_id, resume_id, yecc_result):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            self.resumes.update_yecc_ids(cursor, resume_id, yecc_result)
+            cursor.execute('''
+                UPDATE yecc_outbox SET status = 'done', locked_at = NULL, last_error = NULL,
+                    sections = %s, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            ''', (json.dumps(yecc_result.get('sections') or {}), entry_id))
+            conn.commit()
+    def fail(self, entry_id, attempts, error, sections=None):
+        dead = attempts >= config.YECC_OUTBOX_MAX_ATTEMPTS
+        delay = min(config.YECC_OUTBOX_BACKOFF_MAX, config.YECC_OUTBOX_BACKOFF_BASE * (2 ** (attempts - 1)))
+        delay = delay * random.uniform(0.5, 1.0)
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE yecc_outbox SET status = %s, last_error = %s, locked_at = NULL,
+                    next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                    sections = COALESCE(%s, sections), updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+            ''', ('dead' if dead else 'pending', error, delay, json.dumps(sections) if sections else None, entry_id))
+            conn.commit()
+        return dead
+    def get_latest(self, resume_id):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute('''
+                SELECT o.id, o.status, o.attempts, o.last_error, o.sections, o.next_attempt_at, o.updated_at,
+                    r.yecc_user_id, r.yecc_resume_url, r.yecc_profile_url
+                FROM yecc_outbox o JOIN resumes r ON r.id = o.resume_id
+                WHERE o.resume_id = %s
+                ORDER BY o.id DESC
+                LIMIT 1
+            ''', (resume_id,))
+            row = cursor.fetchone()
+        if not row:
+            return None
+        return {
+            'resume_id': resume_id,
+            'status': row['status'],
+            'attempts': row['attempts'],
+            'last_error': row['last_error'],
+            'sections': json.loads(row['sections'] or '{}'),
+            'next_attempt_at': row['next_attempt_at'].isoformat() if row['status'] == 'pending' and row['next_attempt_at'] else None,
+            'updated_at': row['updated_at'].isoformat() if row['updated_at'] else None,
+            'yecc_user_id': row['yecc_user_id'] or None,
+            'yecc_resume_url': row['yecc_resume_url'] or None,
+            'yecc_profile_url': row['yecc_profile_url'] or None
+        }
+    def get_counts(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT status, COUNT(*) FROM yecc_outbox GROUP BY status')
+            rows = cursor.fetchall()
+        return {status: count for status, count in rows}
+outbox_repository = OutboxRepository()
@@ -0,0 +1,61 @@
+import json
+from src.config import config
+from src.repositories.connection_pool import db_pool
+class ParseCacheRepository:
+    def __init__(self, pool=None):
+        self.database_url = config.DATABASE_URL
+        if not self.database_url:
+            raise Exception("DATABASE_URL environment variable is required")
+        self.pool = pool or db_pool
+        self._init_database()
+    def _init_database(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    schema_version TEXT NOT NULL,
+                    provider TEXT,
+                    parsed_json TEXT NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+    def get(self, cache_key, schema_version):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE parse_cache SET hit_count = hit_count + 1
+                WHERE cache_key = %s AND schema_version = %s
+                RETURNING parsed_json, provider
+            ''', (cache_key, schema_version))
+            row = cursor.fetchone()
+            conn.commit()
+        if not row:
+            return None
+        return {'parsed': json.loads(row[0]), 'provider': row[1]}
+    def put(self, cache_key, kind, content_hash, schema_version, parsed, provider):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO parse_cache (cache_key, kind, content_hash, schema_version, provider, parsed_json)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    schema_version = EXCLUDED.schema_version,
+                    provider = EXCLUDED.provider,
+                    parsed_json = EXCLUDED.parsed_json,
+                    hit_count = 0,
+                    created_at = CURRENT_TIMESTAMP
+            ''', (cache_key, kind, content_hash, schema_version, provider, json.dumps(parsed)))
+            conn.commit()
+    def delete_expired(self, max_age_days):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM parse_cache WHERE created_at < CURRENT_TIMESTAMP - make_interval(days => %s)', (max_age_days,))
+            deleted = cursor.rowcount
+            conn.commit()
+        return deleted
+parse_cache_repository = ParseCacheRepository()
@@ -0,0 +1,76 @@
+from src.config import config
+from src.repositories.connection_pool import db_pool
+class RateLimitRepository:
+    def __init__(self, pool=None):
+        self.database_url = config.DATABASE_URL
+        if not self.database_url:
+            raise Exception("DATABASE_URL environment variable is required")
+        self.pool = pool or db_pool
+        self._init_database()
+    def _init_database(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS llm_rate_limits (
+                    provider TEXT PRIMARY KEY,
+                    tokens DOUBLE PRECISION NOT NULL,
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS llm_leases (
+                    id BIGSERIAL PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    pid INTEGER,
+                    expires_at TIMESTAMPTZ NOT NULL
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_leases_provider ON llm_leases(provider, expires_at)')
+            conn.commit()
+    def try_acquire(self, provider, rate_per_second, burst, max_in_flight, lease_seconds, pid):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO llm_rate_limits (provider, tokens) VALUES (%s, %s)
+                ON CONFLICT (provider) DO NOTHING
+            ''', (provider, burst))
+            cursor.execute('''
+                SELECT LEAST(%s, tokens + EXTRACT(EPOCH FROM clock_timestamp() - updated_at) * %s)
+                FROM llm_rate_limits WHERE provider = %s
+                FOR UPDATE
+            ''', (burst, rate_per_second, provider))
+            tokens = cursor.fetchone()[0]
+            cursor.execute('DELETE FROM llm_leases WHERE provider = %s AND expires_at < clock_timestamp()', (provider,))
+            cursor.execute('SELECT COUNT(*) FROM llm_leases WHERE provider = %s', (provider,))
+            in_flight = cursor.fetchone()[0]
+            if tokens < 1 or in_flight >= max_in_flight:
+                conn.commit()
+                wait = (1 - tokens) / rate_per_second if tokens < 1 else None
+                return None, wait
+            cursor.execute('''
+                UPDATE llm_rate_limits SET tokens = %s, updated_at = clock_timestamp()
+                WHERE provider = %s
+            ''', (tokens - 1, provider))
+            cursor.execute('''
+                INSERT INTO llm_leases (provider, pid, expires_at)
+                VALUES (%s, %s, clock_timestamp() + make_interval(secs => %s))
+                RETURNING id
+            ''', (provider, pid, lease_seconds))
+            lease_id = cursor.fetchone()[0]
+            conn.commit()
+        return lease_id, 0
+    def release(self, lease_id):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM llm_leases WHERE id = %s', (lease_id,))
+            conn.commit()
+    def get_usage(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT provider, COUNT(*) FROM llm_leases
+                WHERE expires_at > clock_timestamp()
+                GROUP BY provider
+            ''')
+            return dict(cursor.fetchall())
+rate_limit_repository = RateLimitRepository() if config.LLM_RATE_LIMIT_SHARED else None
@@ -1,67 +1,127 @@
 import os
 import json
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime
 from src.config import config
+from src.repositories.connection_pool import db_pool
+from src.utils.text_vectorizer import HashingVectorizer
+INSERT_COLUMNS = '''
+    timestamp, name, email, phone, location, linkedin, summary,
+    total_years_experience, role_title, company_name,
+    erp_systems, erp_modules, technical_skills, certifications,
+    education, job_experience, erp_projects,
+    completeness_score, yecc_user_id, yecc_resume_url, yecc_profile_url, embedding
+'''
 class ResumeRepository:
-    def __init__(self):
+    def __init__(self, pool=None):
         self.database_url = config.DATABASE_URL
         if not self.database_url:
             raise Exception("DATABASE_URL environment variable is required")
+        self.pool = pool or db_pool
+        self.trigram_enabled = False
+        self.vectorizer = HashingVectorizer(config.VECTOR_DIM)
         self._init_database()
-    def _get_connection(self):
-        conn = psycopg2.connect(self.database_url)
-        return conn
     def _init_database(self):
-        conn = self._get_connection()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS resumes (
+                    id SERIAL PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    name TEXT,
+                    email TEXT,
+                    phone TEXT,
+                    location TEXT,
+                    linkedin TEXT,
+                    summary TEXT,
+                    total_years_experience TEXT,
+                    role_title TEXT,
+                    company_name TEXT,
+                    erp_systems TEXT,
+                    erp_modules TEXT,
+                    technical_skills TEXT,
+                    certifications TEXT,
+                    education TEXT,
+                    job_experience TEXT,
+                    erp_projects TEXT,
+                    completeness_score INTEGER DEFAULT 0,
+                    yecc_user_id TEXT,
+                    yecc_resume_url TEXT,
+                    yecc_profile_url TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_name ON resumes(name)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_email ON resumes(email)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_erp_systems ON resumes(erp_systems)')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS corpus_version (
+                    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                    version BIGINT NOT NULL DEFAULT 0
+                )
+            ''')
+            cursor.execute('INSERT INTO corpus_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS yecc_outbox (
+                    id SERIAL PRIMARY KEY,
+                    resume_id INTEGER NOT NULL REFERENCES resumes(id) ON DELETE CASCADE,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER DEFAULT 0,
+                    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    locked_at TIMESTAMP,
+                    last_error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('ALTER TABLE yecc_outbox ADD COLUMN IF NOT EXISTS sections TEXT')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_yecc_outbox_due ON yecc_outbox(status, next_attempt_at)')
+            conn.commit()
+            self._init_search(conn)
+        print("✅ PostgreSQL database initialized")
+    def _init_search(self, conn):
         cursor = conn.cursor()
+        cursor.execute('ALTER TABLE resumes ADD COLUMN IF NOT EXISTS embedding BYTEA')
+        cursor.execute('ALTER TABLE resumes ADD COLUMN IF NOT EXISTS search_vector tsvector')
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS resumes (
-                id SERIAL PRIMARY KEY,
-                timestamp TEXT NOT NULL,
-                name TEXT,
-                email TEXT,
-                phone TEXT,
-                location TEXT,
-                linkedin TEXT,
-                summary TEXT,
-                total_years_experience TEXT,
-                role_title TEXT,
-                company_name TEXT,
-                erp_systems TEXT,
-                erp_modules TEXT,
-                technical_skills TEXT,
-                certifications TEXT,
-                education TEXT,
-                job_experience TEXT,
-                erp_projects TEXT,
-                completeness_score INTEGER DEFAULT 0,
-                yecc_user_id TEXT,
-                yecc_resume_url TEXT,
-                yecc_profile_url TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+            CREATE OR REPLACE FUNCTION resumes_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(NEW.role_title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(NEW.erp_systems, '') || ' ' ||
+                        coalesce(NEW.erp_modules, '') || ' ' || coalesce(NEW.technical_skills, '')), 'B') ||
+                    setweight(to_tsvector('english', coalesce(NEW.certifications, '') || ' ' ||
+                        coalesce(NEW.company_name, '') || ' ' || coalesce(NEW.location, '') || ' ' ||
+                        coalesce(NEW.email, '')), 'C') ||
+                    setweight(to_tsvector('english', coalesce(NEW.summary, '')), 'D');
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
         ''')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_name ON resumes(name)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_email ON resumes(email)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_erp_systems ON resumes(erp_systems)')
-        conn.commit()
-        conn.close()
-        print("✅ PostgreSQL database initialized")
-    def save(self, parsed_data):
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        cursor.execute('DROP TRIGGER IF EXISTS resumes_search_vector_trigger ON resumes')
         cursor.execute('''
-            INSERT INTO resumes (
-                timestamp, name, email, phone, location, linkedin, summary,
-                total_years_experience, role_title, company_name,
-                erp_systems, erp_modules, technical_skills, certifications,
-                education, job_experience, erp_projects,
-                completeness_score, yecc_user_id, yecc_resume_url, yecc_profile_url
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-        ''', (
+            CREATE TRIGGER resumes_search_vector_trigger
+            BEFORE INSERT OR UPDATE ON resumes
+            FOR EACH ROW EXECUTE FUNCTION resumes_search_vector_update()
+        ''')
+        cursor.execute('UPDATE resumes SET id = id WHERE search_vector IS NULL')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_search_vector ON resumes USING GIN(search_vector)')
+        conn.commit()
+        try:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_name_trgm ON resumes USING GIN(name gin_trgm_ops)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_resumes_email_trgm ON resumes USING GIN(email gin_trgm_ops)')
+            conn.commit()
+            self.trigram_enabled = True
+        except Exception as e:
+            conn.rollback()
+            self.trigram_enabled = False
+            print(f"⚠️ pg_trgm unavailable, fuzzy name search disabled: {e}")
+    def _to_row(self, parsed_data):
+        return (
             datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             parsed_data.get('name', ''),
             parsed_data.get('email', ''),
@@ -82,41 +142,193 @@ class ResumeRepository:
             parsed_data.get('_completeness_score', 0),
             parsed_data.get('_yecc_user_id', ''),
             parsed_data.get('_yecc_resume_url', ''),
-            parsed_data.get('_yecc_profile_url', '')
-        ))
-        resume_id = cursor.fetchone()[0]
-        conn.commit()
-        conn.close()
+            parsed_data.get('_yecc_profile_url', ''),
+            self._embed(parsed_data)
+        )
+    def _embed(self, parsed_data):
+        vector = self.vectorizer.transform_fields(HashingVectorizer.resume_fields(parsed_data))
+        return psycopg2.Binary(self.vectorizer.to_bytes(vector))
+    @staticmethod
+    def syncable(parsed_data):
+        return bool(parsed_data.get('name') or parsed_data.get('email') or parsed_data.get('phone'))
+    def _enqueue_sync(self, cursor, resume_ids, parsed_items):
+        rows = [
+            (resume_id, json.dumps(parsed_data))
+            for resume_id, parsed_data in zip(resume_ids, parsed_items)
+            if self.syncable(parsed_data)
+        ]
+        if rows:
+            execute_values(cursor, 'INSERT INTO yecc_outbox (resume_id, payload) VALUES %s', rows)
+    def save(self, parsed_data, sync=True):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                INSERT INTO resumes ({INSERT_COLUMNS})
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            ''', self._to_row(parsed_data))
+            resume_id = cursor.fetchone()[0]
+            if sync:
+                self._enqueue_sync(cursor, [resume_id], [parsed_data])
+            self._bump_corpus_version(cursor)
+            conn.commit()
         print(f"✅ Data saved to PostgreSQL (ID: {resume_id})")
         return resume_id
+    def save_many(self, parsed_items, sync=True):
+        if not parsed_items:
+            return []
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            rows = execute_values(cursor, f'''
+                INSERT INTO resumes ({INSERT_COLUMNS})
+                VALUES %s
+                RETURNING id
+            ''', [self._to_row(parsed_data) for parsed_data in parsed_items], page_size=len(parsed_items), fetch=True)
+            resume_ids = [row[0] for row in rows]
+            if sync:
+                self._enqueue_sync(cursor, resume_ids, parsed_items)
+            self._bump_corpus_version(cursor)
+            conn.commit()
+        print(f"✅ Batch saved {len(resume_ids)} resumes to PostgreSQL")
+        return resume_ids
+    def _bump_corpus_version(self, cursor):
+        cursor.execute('UPDATE corpus_version SET version = version + 1 WHERE id = 1')
+    def update_yecc_ids(self, cursor, resume_id, yecc_result):
+        cursor.execute('''
+            UPDATE resumes SET yecc_user_id = %s, yecc_resume_url = %s, yecc_profile_url = %s
+            WHERE id = %s
+        ''', (yecc_result.get('user_id'), yecc_result.get('resume_url'), yecc_result.get('yecc_profile_url'), resume_id))
+        self._bump_corpus_version(cursor)
+    def get_corpus_version(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT version FROM corpus_version WHERE id = 1')
+            row = cursor.fetchone()
+        return row[0] if row else 0
     def count(self):
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM resumes')
-        count = cursor.fetchone()[0]
-        conn.close()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM resumes')
+            count = cursor.fetchone()[0]
         return count
     def get_all(self):
-        conn = self._get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        cursor.execute('SELECT * FROM resumes ORDER BY id DESC')
-        rows = cursor.fetchall()
-        conn.close()
-        return [self._row_to_dict(row) for row in rows]
-    def search(self, query):
-        conn = self._get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        pattern = f"%{query}%"
-        cursor.execute('''
-            SELECT * FROM resumes
-            WHERE name ILIKE %s OR email ILIKE %s OR role_title ILIKE %s 
-                  OR erp_systems ILIKE %s OR erp_modules ILIKE %s OR technical_skills ILIKE %s
-                  OR location ILIKE %s OR summary ILIKE %s
-            ORDER BY id DESC
-        ''', (pattern,) * 8)
-        rows = cursor.fetchall()
-        conn.close()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute('SELECT * FROM resumes ORDER BY id DESC')
+            rows = cursor.fetchall()
         return [self._row_to_dict(row) for row in rows]
+    def search(self, query, limit=None):
+        limit = limit or config.SEARCH_RESULT_LIMIT
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute('''
+                SELECT *, ts_rank(search_vector, query, 32) AS rank
+                FROM resumes, websearch_to_tsquery('english', %s) AS query
+                WHERE search_vector @@ query
+                ORDER BY rank DESC, id DESC
+                LIMIT %s
+            ''', (query, limit))
+            rows = cursor.fetchall()
+            match_type = 'full_text'
+            if not rows:
+                rows = self._fuzzy_search(cursor, query, limit)
+                match_type = 'fuzzy'
+        results = []
+        for row in rows:
+            result = self._row_to_dict(row)
+            result['search_rank'] = max(1, min(100, int(round(float(row['rank']) * 100))))
+            result['match_type'] = match_type
+            results.append(result)
+        return results
+    def _fuzzy_search(self, cursor, query, limit):
+        if self.trigram_enabled:
+            cursor.execute('''
+                SELECT *, GREATEST(similarity(name, %s), similarity(email, %s)) AS rank
+                FROM resumes
+                WHERE name %% %s OR email %% %s
+                ORDER BY rank DESC, id DESC
+                LIMIT %s
+            ''', (query, query, query, query, limit))
+        else:
+            pattern = f"%{query}%"
+            cursor.execute('''
+                SELECT *, 0.5 AS rank FROM resumes
+                WHERE name ILIKE %s OR email ILIKE %s
+                ORDER BY id DESC
+                LIMIT %s
+            ''', (pattern, pattern, limit))
+        return cursor.fetchall()
+    def get_embeddings(self, after_id=0, ids=None):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            if ids is not None:
+                cursor.execute('''
+                    SELECT id, embedding FROM resumes
+                    WHERE id = ANY(%s) AND embedding IS NOT NULL AND octet_length(embedding) = %s
+                    ORDER BY id
+                ''', (list(ids), self.vectorizer.dim * 4))
+            else:
+                cursor.execute('''
+                    SELECT id, embedding FROM resumes
+                    WHERE id > %s AND embedding IS NOT NULL AND octet_length(embedding) = %s
+                    ORDER BY id
+                ''', (after_id, self.vectorizer.dim * 4))
+            rows = cursor.fetchall()
+        return [(row[0], self.vectorizer.from_bytes(row[1])) for row in rows]
+    def count_embeddings(self, max_id):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT COUNT(*) FROM resumes
+                WHERE id <= %s AND embedding IS NOT NULL AND octet_length(embedding) = %s
+            ''', (max_id, self.vectorizer.dim * 4))
+            return cursor.fetchone()[0]
+    def get_embedding_ids(self, max_id):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id FROM resumes
+                WHERE id <= %s AND embedding IS NOT NULL AND octet_length(embedding) = %s
+            ''', (max_id, self.vectorizer.dim * 4))
+            return {row[0] for row in cursor.fetchall()}
+    def backfill_embeddings(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute('''
+                SELECT * FROM resumes
+                WHERE embedding IS NULL OR octet_length(embedding) <> %s
+            ''', (self.vectorizer.dim * 4,))
+            rows = cursor.fetchall()
+            if not rows:
+                return 0
+            updates = [(self._embed(self._row_to_parsed(row)), row['id']) for row in rows]
+            cursor.executemany('UPDATE resumes SET embedding = %s WHERE id = %s', updates)
+            conn.commit()
+        print(f"🧮 Backfilled embeddings for {len(updates)} resumes")
+        return len(updates)
+    def get_by_ids(self, resume_ids):
+        if not resume_ids:
+            return []
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute('SELECT * FROM resumes WHERE id = ANY(%s)', (list(resume_ids),))
+            rows = {row['id']: row for row in cursor.fetchall()}
+        return [self._row_to_dict(rows[resume_id]) for resume_id in resume_ids if resume_id in rows]
+    def _row_to_parsed(self, row):
+        def split(value):
+            return [item.strip() for item in (value or '').split(',') if item.strip()]
+        return {
+            'name': row['name'],
+            'current_role': row['role_title'],
+            'current_company': row['company_name'],
+            'location': row['location'],
+            'summary': row['summary'],
+            'total_years_experience': row['total_years_experience'],
+            'erp_systems': split(row['erp_systems']),
+            'erp_modules': split(row['erp_modules']),
+            'technical_skills': split(row['technical_skills']),
+            'certifications': split(row['certifications'])
+        }
     def _row_to_dict(self, row):
         return {
             'id': row['id'],
@@ -0,0 +1,46 @@
+import json
+from src.config import config
+from src.repositories.connection_pool import db_pool
+class SearchCacheRepository:
+    def __init__(self, pool=None):
+        self.database_url = config.DATABASE_URL
+        if not self.database_url:
+            raise Exception("DATABASE_URL environment variable is required")
+        self.pool = pool or db_pool
+        self._init_database()
+    def _init_database(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    corpus_version BIGINT NOT NULL,
+                    results TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+    def get(self, cache_key, corpus_version, ttl):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT results FROM search_cache
+                WHERE cache_key = %s AND corpus_version = %s
+                  AND created_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+            ''', (cache_key, corpus_version, ttl))
+            row = cursor.fetchone()
+        return json.loads(row[0]) if row else None
+    def put(self, cache_key, corpus_version, results):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO search_cache (cache_key, corpus_version, results)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    corpus_version = EXCLUDED.corpus_version,
+                    results = EXCLUDED.results,
+                    created_at = CURRENT_TIMESTAMP
+            ''', (cache_key, corpus_version, json.dumps(results)))
+            cursor.execute('DELETE FROM search_cache WHERE corpus_version < %s', (corpus_version,))
+            conn.commit()
+search_cache_repository = SearchCacheRepository() if config.SEARCH_CACHE_SHARED else None
@@ -0,0 +1,68 @@
+from psycopg2.extras import RealDictCursor, execute_values
+from src.config import config
+from src.repositories.connection_pool import db_pool
+class YeccIdentityRepository:
+    def __init__(self, pool=None):
+        self.database_url = config.DATABASE_URL
+        if not self.database_url:
+            raise Exception("DATABASE_URL environment variable is required")
+        self.pool = pool or db_pool
+        self._init_database()
+    def _init_database(self):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS yecc_identities (
+                    identity_key TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    user_token TEXT,
+                    resume_url TEXT NOT NULL,
+                    payload_hash TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('ALTER TABLE yecc_identities ALTER COLUMN resume_url DROP NOT NULL')
+            conn.commit()
+    def find_or_create(self, identity_keys, create):
+        if not identity_keys:
+            return create()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            for key in sorted(set(identity_keys)):
+                cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', (key,))
+            cursor.execute('''
+                SELECT user_id, user_token, resume_url, payload_hash FROM yecc_identities
+                WHERE identity_key = ANY(%s)
+                ORDER BY updated_at DESC
+                LIMIT 1
+            ''', (list(identity_keys),))
+            row = cursor.fetchone()
+            if row:
+                conn.commit()
+                return dict(row)
+            identity = create()
+            if not identity:
+                conn.rollback()
+                return None
+            self._upsert(cursor, identity_keys, identity['user_id'], identity['user_token'], identity['resume_url'], identity['payload_hash'])
+            conn.commit()
+        return identity
+    def remember(self, identity_keys, user_id, user_token, resume_url, payload_hash):
+        if not identity_keys:
+            return
+        with self.pool.connection() as conn:
+            self._upsert(conn.cursor(), identity_keys, user_id, user_token, resume_url, payload_hash)
+            conn.commit()
+    def _upsert(self, cursor, identity_keys, user_id, user_token, resume_url, payload_hash):
+        execute_values(cursor, '''
+            INSERT INTO yecc_identities (identity_key, user_id, user_token, resume_url, payload_hash)
+            VALUES %s
+            ON CONFLICT (identity_key) DO UPDATE SET
+                user_id = EXCLUDED.user_id,
+                user_token = COALESCE(EXCLUDED.user_token, yecc_identities.user_token),
+                resume_url = COALESCE(EXCLUDED.resume_url, yecc_identities.resume_url),
+                payload_hash = EXCLUDED.payload_hash,
+                updated_at = CURRENT_TIMESTAMP
+        ''', [(key, str(user_id), user_token, resume_url, payload_hash) for key in identity_keys])
+yecc_identity_repository = YeccIdentityRepository()
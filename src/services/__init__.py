@@ -1,4 +1,14 @@
+from .llm_rate_limiter import CallCancelled, LlmRateLimiter, llm_rate_limiter
 from .ai_service import AIService, ai_service
+from .parse_cache_service import ParseCacheService, parse_cache_service
 from .parser_service import ParserService, parser_service
+from .search_cache_service import SearchCacheService, search_cache_service
+from .vector_index_service import VectorIndexService, vector_index_service
 from .search_service import SearchService, search_service
+from .yecc_client import YeccClient, yecc_client
+from .yecc_catalog_service import YeccCatalogService, yecc_catalog_service
 from .yecc_service import sync_to_yecc_api
+from .yecc_outbox_service import YeccOutboxDispatcher, yecc_outbox_dispatcher
+from .pipeline_service import PipelineService, pipeline_service
+from .job_service import JobService, job_service
+from .batch_service import BatchService, BatchTooLarge, batch_service
@@ -1,9 +1,18 @@
 import json
+import random
+import threading
 import time
 import re
+from contextlib import contextmanager
 import google.generativeai as genai
 from openai import OpenAI
 from src.config import config
+from src.services.llm_rate_limiter import CallCancelled, llm_rate_limiter
+from src.utils.circuit_breaker import CircuitBreaker
+from src.utils.json_repair import repair_json, strip_wrappers
+from src.utils.latency_histogram import LatencyHistogram
+RETRY_DELAY_PATTERN = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)")
+CLIENT_ERRORS = {400, 401, 403, 404, 422}
 class AIService:
     def __init__(self):
         genai.configure(api_key=config.GEMINI_API_KEY)
@@ -21,26 +30,172 @@ class AIService:
                 api_key=config.GROK_API_KEY,
                 base_url=config.GROK_API_BASE
             )
-    def call_gemini(self, prompt, retry_count=0):
+        self.concurrency = {
+            "gemini": threading.BoundedSemaphore(config.GEMINI_MAX_CONCURRENCY),
+            "grok": threading.BoundedSemaphore(config.GROK_MAX_CONCURRENCY)
+        }
+        self.latency = {
+            "gemini": LatencyHistogram(config.LLM_LATENCY_WINDOW),
+            "grok": LatencyHistogram(config.LLM_LATENCY_WINDOW)
+        }
+        self.breakers = {
+            provider: CircuitBreaker(
+                provider,
+                window=config.LLM_BREAKER_WINDOW,
+                min_calls=config.LLM_BREAKER_MIN_CALLS,
+                error_rate=config.LLM_BREAKER_ERROR_RATE,
+                slow_call_seconds=config.LLM_BREAKER_SLOW_SECONDS,
+                open_seconds=config.LLM_BREAKER_OPEN_SECONDS
+            )
+            for provider in ("gemini", "grok")
+        }
+    def hedge_delay(self, provider):
+        histogram = self.latency[provider]
+        if len(histogram) < config.PARSE_HEDGE_MIN_SAMPLES:
+            return config.PARSE_HEDGE_DEFAULT_DELAY
+        return max(config.PARSE_HEDGE_MIN_DELAY, histogram.percentile(config.PARSE_HEDGE_PERCENTILE))
+    def get_latency_stats(self):
+        return {provider: histogram.snapshot() for provider, histogram in self.latency.items()}
+    @staticmethod
+    def _check_cancelled(cancel):
+        if cancel is not None and cancel.is_set():
+            raise CallCancelled("Call cancelled")
+    @staticmethod
+    def _status_code(error):
+        status = getattr(error, "status_code", None) or getattr(error, "code", None)
+        return status if isinstance(status, int) else None
+    @staticmethod
+    def _retry_after(error):
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            try:
+                return float(headers.get("retry-after") or 0) or None
+            except (TypeError, ValueError):
+                pass
+        match = RETRY_DELAY_PATTERN.search(str(error))
+        return float(match.group(1)) if match else None
+    @staticmethod
+    def _backoff(attempt, retry_after=None):
+        delay = random.uniform(0, min(config.LLM_BACKOFF_MAX, config.LLM_BACKOFF_BASE * (2 ** attempt)))
+        return max(delay, retry_after or 0)
+    @contextmanager
+    def _slot(self, provider, cancel=None):
+        deadline = time.monotonic() + config.LLM_QUEUE_DEADLINE
+        semaphore = self.concurrency[provider]
+        while not semaphore.acquire(timeout=max(0, min(config.LLM_QUEUE_POLL_INTERVAL, deadline - time.monotonic()))):
+            self._check_cancelled(cancel)
+            if time.monotonic() >= deadline:
+                raise Exception(f"{provider.title()} concurrency limit: still queued after {config.LLM_QUEUE_DEADLINE:.0f}s")
         try:
+            self._check_cancelled(cancel)
+            with llm_rate_limiter.slot(provider, cancel, max(0, deadline - time.monotonic())):
+                yield
+        finally:
+            semaphore.release()
+    def _call_with_retries(self, provider, request, cancel=None):
+        breaker = self.breakers[provider]
+        for attempt in range(config.LLM_MAX_ATTEMPTS):
+            self._check_cancelled(cancel)
+            if breaker.retry_in():
+                raise Exception(f"{provider.title()} circuit open, retry in {breaker.retry_in():.0f}s")
+            error = None
+            with self._slot(provider, cancel):
+                self._check_cancelled(cancel)
+                if not breaker.allow():
+                    raise Exception(f"{provider.title()} circuit open, retry in {breaker.retry_in():.0f}s")
+                started = time.monotonic()
+                try:
+                    result = request()
+                except Exception as e:
+                    error = e
+                latency = time.monotonic() - started
+            if isinstance(error, CallCancelled):
+                breaker.release()
+                raise error
+            if error is not None:
+                status = self._status_code(error)
+                retry_after = self._retry_after(error)
+                if status in CLIENT_ERRORS:
+                    breaker.record_success()
+                    raise error
+                breaker.record_failure(retry_after)
+                if attempt + 1 >= config.LLM_MAX_ATTEMPTS or breaker.retry_in() or (retry_after or 0) > config.LLM_BACKOFF_MAX:
+                    raise error
+                delay = self._backoff(attempt, retry_after)
+                print(f"   Retry {attempt + 1}/{config.LLM_MAX_ATTEMPTS - 1} in {delay:.1f}s ({str(error)[:60]})...")
+                if cancel is not None:
+                    if cancel.wait(delay):
+                        raise CallCancelled("Call cancelled")
+                else:
+                    time.sleep(delay)
+                continue
+            self.latency[provider].record(latency)
+            breaker.record_success(latency)
+            return result
+    def get_breaker_stats(self):
+        return {provider: breaker.snapshot() for provider, breaker in self.breakers.items()}
+    def _consume_stream(self, pieces, stream_parser, cancel=None):
+        if stream_parser is not None:
+            stream_parser.reset()
+        text = []
+        try:
+            for piece in pieces:
+                self._check_cancelled(cancel)
+                if not piece:
+                    continue
+                text.append(piece)
+                if stream_parser is not None:
+                    stream_parser.feed(piece)
+        finally:
+            pieces.close()
+        return "".join(text).strip()
+    @staticmethod
+    def _gemini_pieces(response):
+        for chunk in response:
+            try:
+                yield chunk.text
+            except ValueError:
+                continue
+    @staticmethod
+    def _grok_pieces(response):
+        try:
+            for chunk in response:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content
+        finally:
+            response.close()
+    def call_gemini(self, prompt, cancel=None, stream_parser=None):
+        def request():
+            if stream_parser is not None:
+                text = self._consume_stream(self._gemini_pieces(self.gemini_model.generate_content(prompt, stream=True)), stream_parser, cancel)
+                if not text:
+                    raise Exception("Empty response from Gemini")
+                return text
             response = self.gemini_model.generate_content(prompt)
             if not response.text:
                 raise Exception("Empty response from Gemini")
             return response.text.strip()
-        except Exception as e:
-            if retry_count < 2:
-                print(f"   Retry {retry_count + 1}/3...")
-                time.sleep(1)
-                return self.call_gemini(prompt, retry_count + 1)
-            raise
-    def call_grok(self, prompt, system_instruction="", retry_count=0):
+        return self._call_with_retries("gemini", request, cancel)
+    def call_grok(self, prompt, system_instruction="", cancel=None, stream_parser=None):
         if not self.grok_client:
             raise Exception("Grok API not configured")
-        try:
-            messages = []
-            if system_instruction:
-                messages.append({"role": "system", "content": system_instruction})
-            messages.append({"role": "user", "content": prompt})
+        messages = []
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        messages.append({"role": "user", "content": prompt})
+        def request():
+            if stream_parser is not None:
+                text = self._consume_stream(self._grok_pieces(self.grok_client.chat.completions.create(
+                    model=config.GROK_MODEL,
+                    messages=messages,
+                    temperature=0.1,
+                    max_tokens=4000,
+                    stream=True
+                )), stream_parser, cancel)
+                if not text:
+                    raise Exception("Empty response from Grok")
+                return text
             response = self.grok_client.chat.completions.create(
                 model=config.GROK_MODEL,
                 messages=messages,
@@ -50,33 +205,13 @@ class AIService:
             if not response.choices or not response.choices[0].message.content:
                 raise Exception("Empty response from Grok")
             return response.choices[0].message.content.strip()
-        except Exception as e:
-            if retry_count < 2:
-                print(f"   Retry {retry_count + 1}/3...")
-                time.sleep(1)
-                return self.call_grok(prompt, system_instruction, retry_count + 1)
-            raise
+        return self._call_with_retries("grok", request, cancel)
     @staticmethod
     def parse_json_response(content):
         if not content or not content.strip():
             raise json.JSONDecodeError("Empty content", "", 0)
-        content = re.sub(r'```json\s*', '', content)
-        content = re.sub(r'```\s*', '', content)
-        content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL)
-        content = re.sub(r'<thinking>.*?</thinking>', '', content, flags=re.DOTALL)
-        content = content.strip()
-        start = content.find('{')
-        end = content.rfind('}')
-        if start == -1 or end == -1 or end <= start:
-            raise json.JSONDecodeError("No JSON found", content, 0)
-        json_str = content[start:end+1]
-        open_braces = json_str.count('{')
-        close_braces = json_str.count('}')
-        open_brackets = json_str.count('[')
-        close_brackets = json_str.count(']')
-        if open_braces > close_braces:
-            json_str += '}' * (open_braces - close_braces)
-        if open_brackets > close_brackets:
-            json_str += ']' * (open_brackets - close_brackets)
-        return json.loads(json_str)
+        parsed, repairs = repair_json(strip_wrappers(content))
+        if repairs:
+            print(f"   🩹 Repaired malformed JSON: {', '.join(repairs)}")
+        return parsed, repairs
 ai_service = AIService()
@@ -0,0 +1,141 @@
+import io
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from werkzeug.utils import secure_filename
+from src.config import config
+from src.repositories import resume_repository
+from src.services.parse_cache_service import parse_cache_service
+from src.services.pipeline_service import pipeline_service
+from src.services.yecc_outbox_service import yecc_outbox_dispatcher
+from src.utils.extraction_sandbox import sandboxed_extract_text
+from src.utils.file_handler import allowed_file
+from src.utils.pdf_extractor import disable_parallel_extraction
+class BatchTooLarge(Exception):
+    pass
+class BatchService:
+    def __init__(self, repository=None, pipeline=None):
+        self.repository = repository or resume_repository
+        self.pipeline = pipeline or pipeline_service
+    @staticmethod
+    def expand_upload(filename, file_bytes, max_size=None):
+        max_size = config.BATCH_MAX_TOTAL_SIZE if max_size is None else max_size
+        if not filename.lower().endswith('.zip'):
+            if len(file_bytes) > max_size:
+                raise BatchTooLarge(f"Batch exceeds {config.BATCH_MAX_TOTAL_SIZE // (1024 * 1024)} MB")
+            return [(secure_filename(filename), file_bytes)]
+        files = []
+        total = 0
+        with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
+            members = archive.infolist()
+            if len(members) > config.BATCH_MAX_ARCHIVE_MEMBERS:
+                raise BatchTooLarge(f"{filename} has {len(members)} entries, the limit is {config.BATCH_MAX_ARCHIVE_MEMBERS}")
+            for member in members:
+                name = os.path.basename(member.filename)
+                if member.is_dir() or member.filename.startswith('__MACOSX/') or not name or name.startswith('.'):
+                    continue
+                if not allowed_file(name) or member.file_size > config.MAX_CONTENT_LENGTH:
+                    continue
+                total += member.file_size
+                if total > max_size:
+                    raise BatchTooLarge(f"Batch exceeds {config.BATCH_MAX_TOTAL_SIZE // (1024 * 1024)} MB once {filename} is uncompressed")
+                files.append((secure_filename(name), archive.read(member)))
+        return files
+    @staticmethod
+    def pack(files):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+            for filename, file_bytes in files:
+                archive.writestr(filename, file_bytes)
+        return buffer.getvalue()
+    @staticmethod
+    def limit(files):
+        return files[:config.BATCH_MAX_FILES], [filename for filename, _ in files[config.BATCH_MAX_FILES:]]
+    @staticmethod
+    def _extract_pool():
+        if config.EXTRACT_SANDBOX_ENABLED:
+            return ThreadPoolExecutor(max_workers=min(config.BATCH_EXTRACT_WORKERS, config.EXTRACT_SANDBOX_WORKERS))
+        mp_context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=config.BATCH_EXTRACT_WORKERS, mp_context=mp_context, initializer=disable_parallel_extraction)
+    def ingest(self, files, sync=True, use_llm=None, on_progress=None):
+        files, dropped = self.limit(files)
+        progress = on_progress or (lambda detail: None)
+        started = time.time()
+        print(f"\n📦 Batch ingesting {len(files)} resumes...")
+        if dropped:
+            print(f"⚠️ Over the {config.BATCH_MAX_FILES} file limit, dropped {len(dropped)} files")
+        reports = [{'filename': filename, 'success': False} for filename, _ in files]
+        parsed_items = [None] * len(files)
+        pending = []
+        for idx, (filename, file_bytes) in enumerate(files):
+            if not allowed_file(filename):
+                reports[idx]['error'] = 'Invalid file type'
+                continue
+            file_hash = parse_cache_service.hash_bytes(file_bytes)
+            cached = self.pipeline.lookup_cached(file_hash)
+            if cached:
+                parsed_items[idx] = cached
+                reports[idx]['cached'] = True
+            else:
+                pending.append((idx, filename, file_bytes, file_hash))
+        parse_workers = config.GEMINI_MAX_CONCURRENCY + config.GROK_MAX_CONCURRENCY
+        with self._extract_pool() as extract_pool, \
+                ThreadPoolExecutor(max_workers=parse_workers) as parse_pool:
+            extract_futures = {
+                extract_pool.submit(sandboxed_extract_text, file_bytes, filename, False): (idx, filename, file_hash)
+                for idx, filename, file_bytes, file_hash in pending
+            }
+            parse_futures = {}
+            for extracted, future in enumerate(as_completed(extract_futures), 1):
+                progress(f'{extracted}/{len(pending)} extracted')
+                idx, filename, file_hash = extract_futures[future]
+                try:
+                    resume_text = future.result()
+                    self.pipeline.check_text(resume_text)
+                except Exception as e:
+                    reports[idx]['error'] = f'Text extraction failed: {str(e)}'
+                    continue
+                parse_futures[parse_pool.submit(self.pipeline.parse, resume_text, filename, file_hash, use_llm)] = idx
+            for done, future in enumerate(as_completed(parse_futures), 1):
+                progress(f'{done}/{len(parse_futures)} parsed')
+                idx = parse_futures[future]
+                try:
+                    parsed_items[idx] = future.result()
+                except Exception as e:
+                    reports[idx]['error'] = f'AI parsing failed: {str(e)}'
+        ready = [idx for idx, parsed_data in enumerate(parsed_items) if parsed_data]
+        for idx in ready:
+            self.pipeline.finalize(parsed_items[idx])
+        try:
+            resume_ids = self.repository.save_many([parsed_items[idx] for idx in ready], sync=sync)
+        except Exception as e:
+            for idx in ready:
+                reports[idx]['error'] = f'Database save failed: {str(e)}'
+            resume_ids = []
+        for idx, resume_id in zip(ready, resume_ids):
+            parsed_data = parsed_items[idx]
+            reports[idx].update({
+                'success': True,
+                'resume_id': resume_id,
+                'name': parsed_data.get('name', ''),
+                'email': parsed_data.get('email', ''),
+                'provider': parsed_data.get('_parse_provider'),
+                'completeness_score': parsed_data.get('_completeness_score', 0),
+                'json_repairs': parsed_data.get('_json_repairs', [])
+            })
+        if sync and resume_ids:
+            yecc_outbox_dispatcher.notify()
+        succeeded = sum(1 for report in reports if report['success'])
+        elapsed = time.time() - started
+        print(f"✅ Batch complete: {succeeded}/{len(files)} succeeded in {elapsed:.1f}s")
+        return {
+            'total': len(files),
+            'succeeded': succeeded,
+            'failed': len(files) - succeeded,
+            'elapsed_seconds': round(elapsed, 2),
+            'dropped': dropped,
+            'results': reports
+        }
+batch_service = BatchService()
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+from src.config import config
+from src.repositories import job_repository
+from src.services.batch_service import batch_service
+from src.services.pipeline_service import STAGES, pipeline_service
+class JobService:
+    def __init__(self, repository=None, pipeline=None, workers=None, batch=None):
+        self.repository = repository or job_repository
+        self.pipeline = pipeline or pipeline_service
+        self.batch = batch or batch_service
+        self.workers = workers or config.JOB_WORKERS
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._changed = threading.Condition()
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._wakeup = threading.Event()
+            for idx in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"upload-job-worker-{idx}", daemon=True)
+                thread.start()
+        print(f"⚙️ Started {self.workers} upload job workers (PID {self._pid})")
+    def submit(self, filename, file_bytes):
+        stages = {stage: {'status': 'pending'} for stage in STAGES}
+        job_id = self.repository.enqueue(filename, file_bytes, stages)
+        print(f"\n📥 Queued upload job {job_id} for {filename}")
+        self.start()
+        self._wakeup.set()
+        return job_id
+    def submit_batch(self, files, sync=True, use_llm=None):
+        files, dropped = self.batch.limit(files)
+        options = {'sync': sync, 'use_llm': use_llm, 'files': len(files), 'dropped': dropped}
+        job_id = self.repository.enqueue(f'batch of {len(files)} files', self.batch.pack(files), {'ingest': {'status': 'pending'}}, kind='batch', options=options)
+        print(f"\n📥 Queued batch job {job_id} with {len(files)} files" + (f", dropped {len(dropped)} over the limit" if dropped else ""))
+        self.start()
+        self._wakeup.set()
+        return job_id, dropped
+    def get(self, job_id):
+        return self.repository.get(job_id)
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+    @staticmethod
+    def _event(name, data):
+        return f"event: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+    def stream_events(self, job_id):
+        stages = {}
+        partial = {}
+        deadline = time.monotonic() + config.JOB_EVENTS_WINDOW
+        last_sent = time.monotonic()
+        while True:
+            job = self.repository.get(job_id)
+            if not job:
+                yield self._event('error', {'error': 'Job not found'})
+                return
+            events = []
+            for stage, entry in job['stages'].items():
+                if stages.get(stage) != entry:
+                    stages[stage] = entry
+                    events.append(self._event('stage', {'stage': stage, **entry}))
+            for field, value in job['partial'].items():
+                if partial.get(field) != value:
+                    partial[field] = value
+                    events.append(self._event('field', {'field': field, 'value': value}))
+            for field in set(partial) - set(job['partial']):
+                del partial[field]
+                events.append(self._event('field', {'field': field, 'value': None}))
+            if job['status'] in ('completed', 'failed'):
+                events.append(self._event('done', {key: job[key] for key in ('job_id', 'status', 'result', 'error')}))
+            now = time.monotonic()
+            if events:
+                last_sent = now
+                yield "".join(events)
+                if job['status'] in ('completed', 'failed'):
+                    return
+            elif now - last_sent >= config.JOB_EVENTS_HEARTBEAT:
+                last_sent = now
+                yield ": keep-alive\n\n"
+            if now >= deadline:
+                yield self._event('reconnect', {'job_id': job_id, 'status': job['status']})
+                return
+            with self._changed:
+                self._changed.wait(config.JOB_EVENTS_POLL_INTERVAL)
+    def _worker_loop(self):
+        while True:
+            try:
+                job = self.repository.claim_next(config.JOB_STALE_SECONDS, config.JOB_MAX_ATTEMPTS)
+            except Exception as e:
+                print(f"⚠️ Job claim failed: {e}")
+                job = None
+            if not job:
+                self._wakeup.wait(config.JOB_POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+            try:
+                self._run(job)
+            except Exception as e:
+                print(f"⚠️ Job {job['id']} could not be finalized, it will be retried once stale: {e}")
+    def _run(self, job):
+        job_id = job['id']
+        stages = job['stages'] or {stage: {'status': 'pending'} for stage in STAGES}
+        print(f"\n⚙️ Processing job {job_id} ({job['filename']}, attempt {job['attempts']})")
+        def on_stage(stage, status, detail=None):
+            entry = stages.setdefault(stage, {})
+            entry['status'] = status
+            if detail:
+                entry['detail'] = detail
+            entry['updated_at'] = time.time()
+            try:
+                self.repository.update_stages(job_id, stages)
+            except Exception as e:
+                print(f"⚠️ Job stage update failed: {e}")
+            self._notify()
+        partial = {}
+        def on_field(field, value):
+            if value is None:
+                partial.pop(field, None)
+            else:
+                partial[field] = value
+            try:
+                self.repository.update_partial(job_id, partial)
+            except Exception as e:
+                print(f"⚠️ Job partial update failed: {e}")
+            self._notify()
+        try:
+            if job.get('kind') == 'batch':
+                result = self._run_batch(job, on_stage)
+            else:
+                result = self.pipeline.process(job['file_data'], job['filename'], on_stage, on_field)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {str(e)}")
+            self.repository.fail(job_id, str(e))
+            self._notify()
+            return
+        self.repository.complete(job_id, result)
+        self._notify()
+        print(f"✅ Job {job_id} completed")
+    def _run_batch(self, job, on_stage):
+        options = job['options']
+        files = self.batch.expand_upload('batch.zip', job['file_data'])
+        on_stage('ingest', 'running', f'{len(files)} files')
+        report = self.batch.ingest(files, sync=options.get('sync', True), use_llm=options.get('use_llm'), on_progress=lambda detail: on_stage('ingest', 'running', detail))
+        report['dropped'] = options.get('dropped', []) + report['dropped']
+        on_stage('ingest', 'completed', f"{report['succeeded']}/{report['total']} succeeded")
+        return report
+job_service = JobService()
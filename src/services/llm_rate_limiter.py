@@ -0,0 +1,88 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from src.config import config
+from src.repositories.rate_limit_repository import rate_limit_repository
+from src.utils.token_bucket import TokenBucket
+LOCAL_LEASE = "local"
+class CallCancelled(Exception):
+    pass
+class LlmRateLimiter:
+    def __init__(self, repository=None):
+        self.repository = repository if repository is not None else rate_limit_repository
+        self.limits = {
+            "gemini": (config.GEMINI_RPM / 60, config.GEMINI_BURST, config.GEMINI_GLOBAL_CONCURRENCY),
+            "grok": (config.GROK_RPM / 60, config.GROK_BURST, config.GROK_GLOBAL_CONCURRENCY)
+        }
+        self.local = {provider: TokenBucket(rate, burst) for provider, (rate, burst, _) in self.limits.items()}
+        self.stats = {provider: {'acquired': 0, 'queued': 0, 'rejected': 0, 'wait_seconds': 0.0} for provider in self.limits}
+        self._shared_failed = False
+        self._lock = threading.Lock()
+    @contextmanager
+    def slot(self, provider, cancel=None, deadline=None):
+        lease_id = self._acquire(provider, time.monotonic() + (config.LLM_QUEUE_DEADLINE if deadline is None else deadline), cancel)
+        try:
+            yield
+        finally:
+            self._release(lease_id)
+    def _acquire(self, provider, deadline, cancel):
+        rate, burst, max_in_flight = self.limits[provider]
+        started = time.monotonic()
+        queued = False
+        while True:
+            lease_id, wait = self._try_acquire(provider, rate, burst, max_in_flight)
+            now = time.monotonic()
+            if lease_id is not None:
+                self._record(provider, 'acquired', now - started, queued)
+                return lease_id
+            if now >= deadline:
+                self._record(provider, 'rejected', now - started, queued)
+                raise Exception(f"{provider.title()} rate limit: still queued after {now - started:.1f}s")
+            if not queued:
+                print(f"   🚦 {provider.title()} at its rate/concurrency limit, queueing...")
+                queued = True
+            delay = min(deadline - now, (wait or config.LLM_QUEUE_POLL_INTERVAL) * random.uniform(1, 1.5))
+            if cancel is not None:
+                if cancel.wait(delay):
+                    raise CallCancelled("Call cancelled")
+            else:
+                time.sleep(delay)
+    def _try_acquire(self, provider, rate, burst, max_in_flight):
+        if self.repository is not None:
+            try:
+                lease_id, wait = self.repository.try_acquire(provider, rate, burst, max_in_flight, config.LLM_LEASE_SECONDS, os.getpid())
+                self._shared_failed = False
+                return lease_id, wait
+            except Exception as e:
+                if not self._shared_failed:
+                    print(f"⚠️ Shared LLM rate limiter unavailable, using per-process limits: {e}")
+                    self._shared_failed = True
+        wait = self.local[provider].try_acquire()
+        return (LOCAL_LEASE, 0) if wait == 0 else (None, wait)
+    def _release(self, lease_id):
+        if lease_id == LOCAL_LEASE:
+            return
+        try:
+            self.repository.release(lease_id)
+        except Exception as e:
+            print(f"⚠️ Failed to release LLM lease {lease_id}: {e}")
+    def _record(self, provider, outcome, waited, queued):
+        with self._lock:
+            stats = self.stats[provider]
+            stats[outcome] += 1
+            stats['queued'] += int(queued)
+            stats['wait_seconds'] = round(stats['wait_seconds'] + waited, 3)
+    def get_stats(self):
+        with self._lock:
+            stats = {provider: dict(values) for provider, values in self.stats.items()}
+        if self.repository is not None:
+            try:
+                for provider, in_flight in self.repository.get_usage().items():
+                    if provider in stats:
+                        stats[provider]['in_flight'] = in_flight
+            except Exception:
+                pass
+        return stats
+llm_rate_limiter = LlmRateLimiter()
@@ -0,0 +1,61 @@
+import copy
+import hashlib
+import re
+import time
+from src.config import config
+from src.repositories.parse_cache_repository import parse_cache_repository
+from src.utils.json_repair import is_truncated
+from src.utils.lru_cache import LRUCache
+class ParseCacheService:
+    def __init__(self, repository=None, maxsize=None):
+        self.repository = repository or parse_cache_repository
+        self.memory = LRUCache(maxsize or config.PARSE_CACHE_SIZE)
+        self._next_expiry = 0
+    @staticmethod
+    def hash_bytes(data):
+        return hashlib.sha256(data).hexdigest()
+    @staticmethod
+    def hash_text(text):
+        normalized = re.sub(r'\s+', ' ', text or '').strip()
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    def get(self, kind, content_hash, schema_version):
+        cache_key = f"{kind}:{content_hash}"
+        entry = self.memory.get((cache_key, schema_version))
+        if entry is None:
+            try:
+                entry = self.repository.get(cache_key, schema_version)
+            except Exception as e:
+                print(f"⚠️ Parse cache lookup failed: {e}")
+                return None
+            if entry is None:
+                return None
+            self.memory.set((cache_key, schema_version), entry)
+        print(f"⚡ Parse cache hit ({kind}, provider: {entry['provider']})")
+        return copy.deepcopy(entry['parsed'])
+    def put(self, kind, content_hash, schema_version, parsed):
+        if is_truncated(parsed.get('_json_repairs') or []):
+            print(f"⏭️ Not caching a parse recovered from truncated JSON ({kind})")
+            return
+        cache_key = f"{kind}:{content_hash}"
+        parsed = copy.deepcopy(parsed)
+        entry = {'parsed': parsed, 'provider': parsed.get('_parse_provider')}
+        self.memory.set((cache_key, schema_version), entry)
+        try:
+            self.repository.put(cache_key, kind, content_hash, schema_version, parsed, entry['provider'])
+        except Exception as e:
+            print(f"⚠️ Parse cache store failed: {e}")
+        self.expire_old()
+    def expire_old(self):
+        now = time.monotonic()
+        if now < self._next_expiry:
+            return 0
+        self._next_expiry = now + config.PARSE_CACHE_EXPIRE_INTERVAL
+        try:
+            deleted = self.repository.delete_expired(config.PARSE_CACHE_MAX_AGE_DAYS)
+        except Exception as e:
+            print(f"⚠️ Parse cache expiry failed: {e}")
+            return 0
+        if deleted:
+            print(f"🧹 Expired {deleted} parse cache entries older than {config.PARSE_CACHE_MAX_AGE_DAYS} days")
+        return deleted
+parse_cache_service = ParseCacheService()
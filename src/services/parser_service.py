@@ -1,21 +1,38 @@
+import hashlib
 import json
 import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from src.config import config
 from src.services.ai_service import ai_service
+from src.services.parse_cache_service import parse_cache_service
+from src.utils.fact_extractor import CONTACT_EXTRACTORS, fact_extractor
 from src.utils.helpers import clean_array, extract_email, extract_phone, extract_linkedin
+from src.utils.streaming_json import FieldStream, StreamingJsonParser
+from src.utils.text_preprocessor import estimate_tokens, preprocess
+HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=config.PARSE_HEDGE_WORKERS, thread_name_prefix="llm-hedge")
 class ParserService:
     def __init__(self):
         self.json_structure = self._load_json_structure()
+        self.schema_text = json.dumps(self.json_structure, separators=(',', ':'))
+        self.schema_tokens_saved = estimate_tokens(json.dumps(self.json_structure, indent=2)) - estimate_tokens(self.schema_text)
         self.system_instruction = "You are a resume parser. Return ONLY valid JSON with no additional text, no markdown, no explanations."
+        self.prompt_prefix = self._build_prompt_prefix()
+        self.prompt_stats = {'prompts': 0, 'original_tokens': 0, 'prompt_tokens': 0, 'tokens_saved': 0}
+        self._stats_lock = threading.Lock()
+        self.schema_version = self._compute_schema_version()
     def _load_json_structure(self):
         structure_path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'json_structure.json')
         if not os.path.exists(structure_path):
             structure_path = os.path.join(os.path.dirname(__file__), '..', '..', 'json_structure.json')
         with open(structure_path, 'r') as f:
             return json.load(f)
-    def _create_prompt(self, resume_text):
-        json_structure_str = json.dumps(self.json_structure, indent=2)
+    def _compute_schema_version(self):
+        fingerprint = json.dumps(self.json_structure, sort_keys=True) + self.system_instruction + self._create_prompt("") + self._facts_block({}) + fact_extractor.version
+        return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+    def _build_prompt_prefix(self):
         return f"""Extract information from this resume and return ONLY valid JSON matching this exact structure:
-{json_structure_str}
+{self.schema_text}
 IMPORTANT EXTRACTION RULES:
 1. TRACK DETECTION FOR ERP PROJECTS (erp_projects_experience.track):
    - If the track is explicitly mentioned (HCM, SCM, Financials, Technical), use that value.
@@ -39,45 +56,193 @@ IMPORTANT EXTRACTION RULES:
    - Common languages to look for: English, Hindi, Tamil, Telugu, Kannada, Malayalam, Marathi, Bengali, Gujarati, Punjabi, Urdu, Arabic, French, German, Spanish, etc.
    - If no languages section exists but resume is written in English, include "English" as default.
    - Return as array: ["English", "Hindi", "Tamil"] etc.
-Resume:
-{resume_text}
-Return ONLY the JSON object with no additional text:"""
-    def parse(self, resume_text, candidate_name="Unknown"):
+"""
+    def _facts_block(self, facts):
+        contact = ", ".join(CONTACT_EXTRACTORS)
+        lists = ", ".join(fact_extractor.list_fields)
+        return f"""KNOWN FACTS (already extracted from the resume text):
+{json.dumps(facts, separators=(',', ':'))}
+   - Omit {contact} from your JSON when they appear in the known facts; they are filled in automatically.
+   - For {lists}, return ONLY items that are not already listed in the known facts.
+"""
+    def _create_prompt(self, resume_text, facts=None):
+        facts_block = self._facts_block(facts) if facts else ""
+        return f"{self.prompt_prefix}{facts_block}Resume:\n{resume_text}\nReturn ONLY the JSON object with no additional text:"
+    def prepare(self, resume_text):
+        prepared, stats = preprocess(resume_text, config.PARSE_TOKEN_BUDGET)
+        saved = stats['original_tokens'] - stats['tokens'] + self.schema_tokens_saved
+        with self._stats_lock:
+            self.prompt_stats['prompts'] += 1
+            self.prompt_stats['original_tokens'] += stats['original_tokens'] + self.schema_tokens_saved
+            self.prompt_stats['prompt_tokens'] += stats['tokens']
+            self.prompt_stats['tokens_saved'] += saved
+        print(f"✂️ Preprocessed resume: ~{stats['original_tokens']:,} → ~{stats['tokens']:,} tokens (~{saved:,} prompt tokens saved)")
+        print(f"   Sections: {', '.join(stats['sections'])}; boilerplate lines removed: {stats['boilerplate_lines']}")
+        if stats['trimmed']:
+            print(f"   ⚠️ Over the {config.PARSE_TOKEN_BUDGET:,} token budget, trimmed: {', '.join(stats['trimmed'])}")
+        return prepared
+    def get_prompt_stats(self):
+        with self._stats_lock:
+            return dict(self.prompt_stats)
+    def parse(self, resume_text, candidate_name="Unknown", use_llm=None, on_field=None):
+        facts = fact_extractor.extract(resume_text)
+        print(f"🔎 Pre-extracted facts: {', '.join(facts) or 'none'}")
+        emit = self._field_emitter(on_field, facts)
+        resume_text = self.prepare(resume_text)
+        if not (config.PARSE_USE_LLM if use_llm is None else use_llm):
+            return self._parse_with_rules(resume_text, facts)
+        text_hash = parse_cache_service.hash_text(resume_text + json.dumps(facts, sort_keys=True))
+        cached = parse_cache_service.get('text', text_hash, self.schema_version)
+        if cached:
+            if emit:
+                for field, value in cached.items():
+                    emit(field, value)
+            return cached
+        parsed = self._merge_facts(self._parse_with_llm(resume_text, candidate_name, facts, emit), facts)
+        parse_cache_service.put('text', text_hash, self.schema_version, parsed)
+        return parsed
+    def _field_emitter(self, on_field, facts):
+        if not on_field:
+            return None
+        sent = {}
+        lock = threading.Lock()
+        def emit(field, value):
+            if field.startswith('_'):
+                return
+            if field in facts:
+                if not isinstance(facts[field], list) or value is None:
+                    value = facts[field]
+                elif isinstance(value, list):
+                    value = clean_array(facts[field] + value)
+            if value is None:
+                with lock:
+                    if sent.pop(field, None) is not None:
+                        on_field(field, None)
+                return
+            if value in ("", [], {}):
+                return
+            with lock:
+                if sent.get(field) == value:
+                    return
+                sent[field] = value
+                on_field(field, value)
+        for field, value in facts.items():
+            emit(field, value)
+        return emit
+    def _stream_parser(self, fields, provider):
+        on_field = fields.for_provider(provider)
+        return StreamingJsonParser(on_field) if on_field and config.PARSE_STREAMING_ENABLED else None
+    def _merge_facts(self, parsed, facts):
+        for field, value in facts.items():
+            if isinstance(value, list):
+                parsed[field] = clean_array(value + (parsed.get(field) or []))
+            else:
+                parsed[field] = value
+        return parsed
+    def _parse_with_rules(self, resume_text, facts):
+        parsed = {key: [] if isinstance(value, list) else value for key, value in self.json_structure.items()}
+        first_line = next((line.strip() for line in resume_text.split("\n") if line.strip()), "")
+        words = first_line.split()
+        if 2 <= len(words) <= 4 and all(word.replace(".", "").isalpha() for word in words):
+            parsed['name'] = first_line
+        parsed['_parse_provider'] = 'rules'
+        print(f"📏 Parsed with rules only (no LLM)")
+        return self._merge_facts(parsed, facts)
+    def _parse_with_llm(self, resume_text, candidate_name, facts=None, emit=None):
         print(f"\n{'='*70}")
         print(f"📄 Parsing Resume (Gemini Primary, Grok Fallback)")
         print(f"{'='*70}")
         print(f"Candidate: {candidate_name}")
         print(f"Resume length: {len(resume_text):,} characters")
         print(f"{'='*70}\n")
-        prompt = self._create_prompt(resume_text)
+        prompt = self._create_prompt(resume_text, facts)
         full_prompt = f"{self.system_instruction}\n\n{prompt}"
+        fields = FieldStream(emit)
+        if config.PARSE_HEDGE_ENABLED and ai_service.grok_client:
+            return self._parse_hedged(prompt, full_prompt, fields)
         gemini_error = None
         try:
             print(f"🤖 Trying Gemini (Primary)...")
-            response = ai_service.call_gemini(full_prompt)
-            parsed = ai_service.parse_json_response(response)
+            response = ai_service.call_gemini(full_prompt, stream_parser=self._stream_parser(fields, 'gemini'))
+            parsed = self._load_json(response)
             if self._validate_result(parsed):
                 score = self.score_completeness(parsed)
                 print(f"   Completeness: {score}/100")
                 print(f"   ✅ Gemini succeeded!\n")
+                parsed['_parse_provider'] = 'gemini'
+                fields.commit('gemini')
                 return parsed
             else:
                 raise Exception("Parsed JSON has no useful data")
         except Exception as e:
             gemini_error = e
+            fields.drop('gemini')
             print(f"   ❌ Gemini failed: {str(e)[:100]}")
             print(f"   ⚠️  Falling back to Grok...\n")
         try:
             print(f"🤖 Trying Grok (Fallback)...")
-            response = ai_service.call_grok(prompt, self.system_instruction)
-            parsed = ai_service.parse_json_response(response)
+            response = ai_service.call_grok(prompt, self.system_instruction, stream_parser=self._stream_parser(fields, 'grok'))
+            parsed = self._load_json(response)
             score = self.score_completeness(parsed)
             print(f"   Completeness: {score}/100")
             print(f"   ✅ Grok succeeded!\n")
+            parsed['_parse_provider'] = 'grok'
+            fields.commit('grok')
             return parsed
         except Exception as grok_error:
             print(f"   ❌ Grok also failed: {str(grok_error)[:100]}")
             raise Exception(f"All parsers failed. Gemini: {str(gemini_error)[:50]}, Grok: {str(grok_error)[:50]}")
+    @staticmethod
+    def _load_json(response):
+        parsed, repairs = ai_service.parse_json_response(response)
+        if repairs and isinstance(parsed, dict):
+            parsed['_json_repairs'] = repairs
+        return parsed
+    def _attempt(self, provider, prompt, full_prompt, cancel, fields):
+        if provider == 'gemini':
+            response = ai_service.call_gemini(full_prompt, cancel=cancel, stream_parser=self._stream_parser(fields, provider))
+        else:
+            response = ai_service.call_grok(prompt, self.system_instruction, cancel=cancel, stream_parser=self._stream_parser(fields, provider))
+        parsed = self._load_json(response)
+        if not self._validate_result(parsed):
+            raise Exception("Parsed JSON has no useful data")
+        parsed['_parse_provider'] = provider
+        return parsed
+    def _parse_hedged(self, prompt, full_prompt, fields):
+        cancel = threading.Event()
+        delay = ai_service.hedge_delay('gemini')
+        print(f"🤖 Trying Gemini (hedging with Grok after {delay:.1f}s)...")
+        futures = {HEDGE_EXECUTOR.submit(self._attempt, 'gemini', prompt, full_prompt, cancel, fields): 'gemini'}
+        errors = {}
+        hedged = False
+        while futures:
+            done, _ = wait(futures, timeout=None if hedged else delay, return_when=FIRST_COMPLETED)
+            if not done:
+                print(f"   ⏱️  Gemini slower than p{config.PARSE_HEDGE_PERCENTILE:g} ({delay:.1f}s), racing Grok...")
+                futures[HEDGE_EXECUTOR.submit(self._attempt, 'grok', prompt, full_prompt, cancel, fields)] = 'grok'
+                hedged = True
+                continue
+            for future in done:
+                provider = futures.pop(future)
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    errors[provider] = e
+                    fields.drop(provider)
+                    print(f"   ❌ {provider.title()} failed: {str(e)[:100]}")
+                    if not hedged:
+                        print(f"   ⚠️  Falling back to Grok...\n")
+                        futures[HEDGE_EXECUTOR.submit(self._attempt, 'grok', prompt, full_prompt, cancel, fields)] = 'grok'
+                        hedged = True
+                    continue
+                cancel.set()
+                fields.commit(provider)
+                for loser in futures:
+                    loser.cancel()
+                print(f"   Completeness: {self.score_completeness(parsed)}/100")
+                print(f"   ✅ {provider.title()} won{' the race' if hedged and not errors else ''}!\n")
+                return parsed
+        raise Exception(f"All parsers failed. Gemini: {str(errors.get('gemini'))[:50]}, Grok: {str(errors.get('grok'))[:50]}")
     def _validate_result(self, parsed):
         if not isinstance(parsed, dict):
             return False
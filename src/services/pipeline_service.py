@@ -0,0 +1,76 @@
+import time
+from src.repositories import resume_repository
+from src.services.parse_cache_service import parse_cache_service
+from src.services.parser_service import parser_service
+from src.services.yecc_outbox_service import yecc_outbox_dispatcher
+from src.utils.extraction_sandbox import sandboxed_extract_text
+STAGES = ['extract', 'parse', 'save', 'sync']
+class PipelineService:
+    def __init__(self, repository=None):
+        self.repository = repository or resume_repository
+    def process(self, file_bytes, filename, on_stage=None, on_field=None):
+        report = on_stage or (lambda stage, status, detail=None: None)
+        file_hash = parse_cache_service.hash_bytes(file_bytes)
+        parsed_data = self.lookup_cached(file_hash)
+        if parsed_data:
+            report('extract', 'skipped', 'cache hit')
+            report('parse', 'skipped', 'cache hit')
+        else:
+            report('extract', 'running')
+            started = time.time()
+            try:
+                resume_text = self.extract(file_bytes, filename)
+            except Exception as e:
+                report('extract', 'failed', str(e))
+                raise Exception(f'Text extraction failed: {str(e)}')
+            report('extract', 'completed', f'{len(resume_text)} characters in {time.time() - started:.2f}s')
+            report('parse', 'running')
+            started = time.time()
+            try:
+                parsed_data = self.parse(resume_text, filename, file_hash, on_field=on_field)
+            except Exception as e:
+                report('parse', 'failed', str(e))
+                raise Exception(f'AI parsing failed: {str(e)}')
+            report('parse', 'completed', f'{parsed_data.get("_parse_provider", "cache")} in {time.time() - started:.2f}s')
+        self.finalize(parsed_data)
+        report('save', 'running')
+        try:
+            resume_id = self.repository.save(parsed_data)
+        except Exception as e:
+            report('save', 'failed', str(e))
+            raise Exception(f'Database save failed: {str(e)}')
+        report('save', 'completed', f'ID {resume_id}')
+        parsed_data['_resume_id'] = resume_id
+        if self.repository.syncable(parsed_data):
+            report('sync', 'queued', 'Waiting for the YECC outbox')
+            parsed_data['_yecc_sync_url'] = f'/resumes/{resume_id}/sync'
+            yecc_outbox_dispatcher.notify()
+        else:
+            report('sync', 'skipped', 'No name, email or phone to sync')
+        return parsed_data
+    def lookup_cached(self, file_hash):
+        return parse_cache_service.get('file', file_hash, parser_service.schema_version)
+    def extract(self, file_bytes, filename):
+        resume_text = sandboxed_extract_text(file_bytes, filename)
+        print(f"📝 Extracted {len(resume_text)} characters")
+        self.check_text(resume_text)
+        return resume_text
+    @staticmethod
+    def check_text(resume_text):
+        if len(resume_text) < 50:
+            raise Exception("File appears empty or corrupted")
+    def parse(self, resume_text, filename, file_hash, use_llm=None, on_field=None):
+        parsed_data = parser_service.parse(resume_text, filename, use_llm=use_llm, on_field=on_field)
+        if not parsed_data:
+            raise Exception('No data returned from AI')
+        parsed_data = parser_service.enhance(parsed_data, resume_text)
+        print("✅ Data enhanced with post-processing")
+        if parsed_data.get('_parse_provider') != 'rules':
+            parse_cache_service.put('file', file_hash, parser_service.schema_version, parsed_data)
+        return parsed_data
+    def finalize(self, parsed_data):
+        completeness_score = parser_service.score_completeness(parsed_data)
+        print(f"📊 Resume completeness: {completeness_score}%")
+        parsed_data['_completeness_score'] = completeness_score
+        return parsed_data
+pipeline_service = PipelineService()
@@ -0,0 +1,56 @@
+import copy
+import hashlib
+import re
+import threading
+from src.config import config
+from src.repositories import search_cache_repository
+from src.utils.lru_cache import LRUCache
+class SearchCacheService:
+    def __init__(self, repository=None):
+        self.repository = repository or search_cache_repository
+        self.memory = LRUCache(config.SEARCH_CACHE_SIZE, ttl=config.SEARCH_CACHE_TTL)
+        self.stats = {'memory_hits': 0, 'shared_hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+    @staticmethod
+    def make_key(query):
+        normalized = re.sub(r'\s+', ' ', (query or '').lower()).strip()
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    def _count(self, counter):
+        with self._lock:
+            self.stats[counter] += 1
+    def get(self, query, corpus_version):
+        cache_key = self.make_key(query)
+        results = self.memory.get((cache_key, corpus_version))
+        if results is not None:
+            self._count('memory_hits')
+            print(f"⚡ Search cache hit (memory, corpus v{corpus_version})")
+            return copy.deepcopy(results)
+        if self.repository:
+            try:
+                results = self.repository.get(cache_key, corpus_version, config.SEARCH_CACHE_TTL)
+            except Exception as e:
+                print(f"⚠️ Search cache lookup failed: {e}")
+            if results is not None:
+                self._count('shared_hits')
+                self.memory.set((cache_key, corpus_version), results)
+                print(f"⚡ Search cache hit (shared, corpus v{corpus_version})")
+                return copy.deepcopy(results)
+        self._count('misses')
+        return None
+    def put(self, query, corpus_version, results):
+        cache_key = self.make_key(query)
+        self.memory.set((cache_key, corpus_version), copy.deepcopy(results))
+        if self.repository:
+            try:
+                self.repository.put(cache_key, corpus_version, results)
+            except Exception as e:
+                print(f"⚠️ Search cache store failed: {e}")
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['memory_hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['shared_hits']) / lookups, 3) if lookups else 0.0
+        stats['entries'] = len(self.memory)
+        stats['shared_tier'] = self.repository is not None
+        return stats
+search_cache_service = SearchCacheService()
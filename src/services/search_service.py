@@ -1,49 +1,108 @@
 import json
-import google.generativeai as genai
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from src.config import config
 from src.repositories import resume_repository
 from src.services.ai_service import ai_service
+from src.services.search_cache_service import search_cache_service
+from src.services.vector_index_service import vector_index_service
 class SearchService:
     def __init__(self, repository=None):
         self.repository = repository or resume_repository
+        self.rerank_executor = ThreadPoolExecutor(max_workers=config.SEARCH_RERANK_WORKERS)
     def search(self, query):
-        resumes = self.repository.get_all()
-        if not resumes:
-            return []
         try:
-            summaries = []
-            for idx, resume in enumerate(resumes):
-                summary = f"{idx+1}. {resume.get('Name', 'Unknown')} | {resume.get('Current_Role', 'N/A')} | "
-                summary += f"ERP: {resume.get('ERP_Systems', 'N/A')} | Modules: {resume.get('ERP_Modules', 'N/A')} | "
-                summary += f"Skills: {str(resume.get('Technical_Skills', ''))[:100]} | {resume.get('Total_Years_Experience', 'N/A')} yrs"
-                summaries.append(summary)
-            prompt = f"""Search query: "{query}"
+            corpus_version = self.repository.get_corpus_version()
+        except Exception as e:
+            print(f"⚠️ Corpus version unavailable, skipping search cache: {e}")
+            return self._search(query)[0]
+        cached = search_cache_service.get(query, corpus_version)
+        if cached is not None:
+            return cached
+        results, complete = self._search(query)
+        if complete:
+            search_cache_service.put(query, corpus_version, results)
+        return results
+    def _search(self, query):
+        candidates = self._retrieve(query, config.SEARCH_RERANK_TOP_N)
+        if not candidates or not config.SEARCH_RERANK_ENABLED:
+            return candidates, True
+        cancel = threading.Event()
+        future = self.rerank_executor.submit(self._rerank, query, candidates, cancel)
+        try:
+            results = future.result(timeout=config.SEARCH_RERANK_DEADLINE)
+        except TimeoutError:
+            cancel.set()
+            future.cancel()
+            print(f"⏱️ AI rerank exceeded {config.SEARCH_RERANK_DEADLINE}s, returning first-stage results")
+            return candidates, False
+        except Exception as e:
+            cancel.set()
+            future.cancel()
+            print(f"AI rerank error: {e}")
+            return candidates, False
+        if results:
+            print(f"✅ AI rerank kept {len(results)} of {len(candidates)} candidates")
+            return results, True
+        return candidates, True
+    def _retrieve(self, query, limit):
+        fused = {}
+        for source in (self._vector_search, self._fallback_search):
+            try:
+                results = source(query, limit)
+            except Exception as e:
+                print(f"{source.__name__} error: {e}")
+                continue
+            for rank, result in enumerate(results):
+                entry = fused.setdefault(result['id'], [0.0, result])
+                entry[0] += 1.0 / (60 + rank)
+        ranked = sorted(fused.values(), key=lambda entry: -entry[0])
+        return [result for _, result in ranked[:limit]]
+    def _vector_search(self, query, limit):
+        matches = vector_index_service.top_k(query, limit)
+        matches = [(resume_id, score) for resume_id, score in matches if score >= config.SEARCH_MIN_SIMILARITY]
+        if not matches:
+            return []
+        scores = dict(matches)
+        results = self.repository.get_by_ids([resume_id for resume_id, _ in matches])
+        for result in results:
+            result['relevance_score'] = int(round(scores[result['id']] * 100))
+            result['match_reason'] = 'Semantic match'
+        print(f"Vector search found {len(results)} matches across {len(vector_index_service)} resumes")
+        return results
+    def _rerank(self, query, candidates, cancel=None):
+        summaries = []
+        budget = config.SEARCH_RERANK_TOKEN_BUDGET * 4
+        for idx, resume in enumerate(candidates):
+            summary = f"{idx+1}. {resume.get('Name', 'Unknown')} | {resume.get('Current_Role', 'N/A')} | "
+            summary += f"ERP: {resume.get('ERP_Systems', 'N/A')} | Modules: {resume.get('ERP_Modules', 'N/A')} | "
+            summary += f"Skills: {str(resume.get('Technical_Skills', ''))[:100]} | {resume.get('Total_Years_Experience', 'N/A')} yrs"
+            budget -= len(summary) + 1
+            if budget < 0 and summaries:
+                break
+            summaries.append(summary)
+        prompt = f"""Search query: "{query}"
 Find matching candidates from this list. Return ONLY a JSON array:
 [
   {{"candidate_number": 1, "score": 95, "reason": "Strong match"}},
   {{"candidate_number": 3, "score": 80, "reason": "Relevant skills"}}
 ]
 Candidates:
-{chr(10).join(summaries[:30])}
+{chr(10).join(summaries)}
 IMPORTANT: Return ONLY the JSON array, no explanations."""
-            print(f"🔍 AI search with {len(summaries)} candidates")
-            response = ai_service.call_gemini(prompt)
-            matches = self._parse_matches(response)
-            results = []
-            for match in matches:
-                idx = match.get('candidate_number', 0) - 1
-                if 0 <= idx < len(resumes):
-                    resume_data = resumes[idx].copy()
-                    resume_data['relevance_score'] = match.get('score', 80)
-                    resume_data['match_reason'] = match.get('reason', 'AI matched')
-                    results.append(resume_data)
-            if results:
-                print(f"✅ AI search found {len(results)} matches")
-                return results
-            return self._fallback_search(query)
-        except Exception as e:
-            print(f"AI search error: {e}")
-            return self._fallback_search(query)
+        print(f"🔍 AI rerank of {len(summaries)} shortlisted candidates")
+        response = ai_service.call_gemini(prompt, cancel=cancel)
+        matches = self._parse_matches(response)
+        results = []
+        for match in matches:
+            idx = match.get('candidate_number', 0) - 1
+            if 0 <= idx < len(summaries):
+                resume_data = candidates[idx].copy()
+                resume_data['relevance_score'] = match.get('score', 80)
+                resume_data['match_reason'] = match.get('reason', 'AI matched')
+                results.append(resume_data)
+        results.sort(key=lambda result: -(result['relevance_score'] or 0))
+        return results
     def _parse_matches(self, response):
         content = response.strip()
         if content.startswith('```json'):
@@ -53,11 +112,12 @@ IMPORTANT: Return ONLY the JSON array, no explanations."""
         if content.endswith('```'):
             content = content[:-3]
         return json.loads(content.strip())
-    def _fallback_search(self, query):
-        results = self.repository.search(query)
+    def _fallback_search(self, query, limit=None):
+        results = self.repository.search(query, limit)
         for result in results:
-            result['relevance_score'] = 70
-            result['match_reason'] = f"Keyword match: {query}"
+            result['relevance_score'] = result.pop('search_rank', 0)
+            match_type = result.pop('match_type', 'full_text')
+            result['match_reason'] = f"{'Fuzzy name/email' if match_type == 'fuzzy' else 'Keyword'} match: {query}"
         print(f"Keyword search found {len(results)} matches")
         return results
 search_service = SearchService()
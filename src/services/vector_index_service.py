@@ -0,0 +1,78 @@
+import threading
+import numpy as np
+from src.repositories import resume_repository
+class VectorIndexService:
+    def __init__(self, repository=None):
+        self.repository = repository or resume_repository
+        self.vectorizer = self.repository.vectorizer
+        self._matrix = np.zeros((0, self.vectorizer.dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._size = 0
+        self._last_id = 0
+        self._version = None
+        self._loaded = False
+        self._lock = threading.Lock()
+    def _append(self, rows):
+        if not rows:
+            return
+        needed = self._size + len(rows)
+        if needed > len(self._ids):
+            capacity = max(needed, len(self._ids) * 2, 256)
+            matrix = np.zeros((capacity, self.vectorizer.dim), dtype=np.float32)
+            matrix[:self._size] = self._matrix[:self._size]
+            ids = np.zeros(capacity, dtype=np.int64)
+            ids[:self._size] = self._ids[:self._size]
+            self._matrix, self._ids = matrix, ids
+        for resume_id, vector in rows:
+            self._matrix[self._size] = vector
+            self._ids[self._size] = resume_id
+            self._size += 1
+            self._last_id = max(self._last_id, resume_id)
+    def _remove(self, stale):
+        keep = ~np.isin(self._ids[:self._size], list(stale))
+        size = int(keep.sum())
+        self._matrix[:size] = self._matrix[:self._size][keep]
+        self._ids[:size] = self._ids[:self._size][keep]
+        self._size = size
+    def _reconcile(self):
+        stored = self.repository.get_embedding_ids(self._last_id)
+        indexed = set(self._ids[:self._size].tolist())
+        stale = indexed - stored
+        if stale:
+            self._remove(stale)
+        missing = stored - indexed
+        if missing:
+            self._append(self.repository.get_embeddings(ids=sorted(missing)))
+        print(f"🧮 Vector index reconciled: +{len(missing)} late commits, -{len(stale)} removed ({self._size} total)")
+    def refresh(self):
+        with self._lock:
+            if not self._loaded:
+                self.repository.backfill_embeddings()
+                self._loaded = True
+            version = self.repository.get_corpus_version()
+            if version == self._version:
+                return
+            rows = self.repository.get_embeddings(self._last_id)
+            self._append(rows)
+            if rows:
+                print(f"🧮 Vector index: +{len(rows)} resumes ({self._size} total)")
+            if self.repository.count_embeddings(self._last_id) != self._size:
+                self._reconcile()
+            self._version = version
+    def top_k(self, query, k=20):
+        self.refresh()
+        if not self._size:
+            return []
+        query_vector = self.vectorizer.transform(query)
+        if not query_vector.any():
+            return []
+        with self._lock:
+            scores = self._matrix[:self._size] @ query_vector
+            ids = self._ids[:self._size]
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[idx]), float(scores[idx])) for idx in top if scores[idx] > 0]
+    def __len__(self):
+        return self._size
+vector_index_service = VectorIndexService()
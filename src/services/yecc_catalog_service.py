@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from src.config import config
+from src.services.yecc_client import yecc_client
+from src.utils.lru_cache import LRUCache
+SEPARATOR = "\x00"
+def normalize_title(text):
+    return str(text or '').lower()
+class CatalogIndex:
+    def __init__(self, items, key_field="Title"):
+        self.items = items
+        self.titles = [normalize_title(item.get(key_field)) for item in items]
+        self.haystack = SEPARATOR.join(self.titles)
+        self.starts = []
+        offset = 0
+        for title in self.titles:
+            self.starts.append(offset)
+            offset += len(title) + 1
+        self._memo = LRUCache(config.YECC_CATALOG_MEMO_SIZE)
+    def first(self):
+        return self.items[0] if self.items else None
+    def _first_containing(self, needle):
+        pos = self.haystack.find(needle) if self.titles and SEPARATOR not in needle else -1
+        return bisect_right(self.starts, pos) - 1 if pos != -1 else None
+    def _lookup(self, key, find):
+        hit = self._memo.get(key)
+        if hit is None:
+            idx = find()
+            hit = (self.items[idx] if idx is not None else None,)
+            self._memo.set(key, hit)
+        return hit[0]
+    def find_containing(self, *texts):
+        needles = tuple(normalize_title(text) for text in texts)
+        def find():
+            found = [idx for idx in map(self._first_containing, needles) if idx is not None]
+            return min(found) if found else None
+        return self._lookup(('contains', needles), find)
+    def find_overlapping(self, text):
+        needle = normalize_title(text)
+        def find():
+            idx = self._first_containing(needle)
+            return next((i for i in range(len(self.titles) if idx is None else idx) if self.titles[i] in needle), idx)
+        return self._lookup(('overlaps', needle), find)
+class Catalog:
+    def __init__(self, endpoint, items=None, etag=None, last_modified=None, fetched_at=0):
+        self.endpoint = endpoint
+        self.index = CatalogIndex(items or [])
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+    @property
+    def items(self):
+        return self.index.items
+class YeccCatalogService:
+    def __init__(self, client=None, snapshot_dir=None, ttl=None):
+        self.client = client or yecc_client
+        self.snapshot_dir = snapshot_dir or config.YECC_CATALOG_DIR
+        self.ttl = ttl or config.YECC_CATALOG_TTL
+        self._catalogs = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+    def _endpoint_lock(self, endpoint):
+        with self._lock:
+            return self._locks.setdefault(endpoint, threading.Lock())
+    def _snapshot_path(self, endpoint):
+        return os.path.join(self.snapshot_dir, f"{endpoint}.json")
+    def _load_snapshot(self, endpoint):
+        try:
+            with open(self._snapshot_path(endpoint), 'r') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+        print(f"   📂 Loaded {endpoint} catalog snapshot ({len(snapshot.get('items', []))} items)")
+        return Catalog(endpoint, snapshot.get('items', []), snapshot.get('etag'), snapshot.get('last_modified'), 0)
+    def _save_snapshot(self, catalog):
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            path = self._snapshot_path(catalog.endpoint)
+            with open(f"{path}.tmp", 'w') as f:
+                json.dump({'items': catalog.items, 'etag': catalog.etag, 'last_modified': catalog.last_modified}, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"   ⚠️ Could not write {catalog.endpoint} catalog snapshot: {e}")
+    def _fetch(self, endpoint, headers, current):
+        request_headers = dict(headers)
+        if current and current.etag:
+            request_headers["If-None-Match"] = current.etag
+        if current and current.last_modified:
+            request_headers["If-Modified-Since"] = current.last_modified
+        res = self.client.get(endpoint, headers=request_headers)
+        if res.status_code == 304 and current:
+            current.fetched_at = time.time()
+            return current
+        if res.status_code != 200:
+            raise Exception(f"{endpoint} returned {res.status_code}")
+        catalog = Catalog(endpoint, res.json().get("data", []) or [], res.headers.get("ETag"),
+                          res.headers.get("Last-Modified"), time.time())
+        print(f"   📥 Fetched {endpoint} catalog ({len(catalog.items)} items)")
+        self._save_snapshot(catalog)
+        return catalog
+    def get(self, endpoint, headers=None):
+        catalog = self._catalogs.get(endpoint)
+        if catalog and time.time() - catalog.fetched_at < self.ttl:
+            return catalog.index
+        with self._endpoint_lock(endpoint):
+            catalog = self._catalogs.get(endpoint)
+            if catalog and time.time() - catalog.fetched_at < self.ttl:
+                return catalog.index
+            if catalog is None:
+                catalog = self._load_snapshot(endpoint)
+            try:
+                catalog = self._fetch(endpoint, headers or config.get_yecc_headers(), catalog)
+            except Exception as e:
+                if catalog is None:
+                    raise
+                print(f"   ⚠️ Catalog refresh failed for {endpoint}, using cached copy: {e}")
+                catalog.fetched_at = time.time() - self.ttl + config.YECC_CATALOG_RETRY_AFTER
+            self._catalogs[endpoint] = catalog
+            return catalog.index
+    def invalidate(self, endpoint=None):
+        with self._lock:
+            if endpoint:
+                self._catalogs.pop(endpoint, None)
+            else:
+                self._catalogs.clear()
+yecc_catalog_service = YeccCatalogService()
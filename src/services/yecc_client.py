@@ -0,0 +1,96 @@
+import os
+import random
+import re
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from src.config import config
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+class YeccClient:
+    def __init__(self, base_url=None):
+        self.base_url = base_url or config.YECC_BASE_URL
+        self.timeout = (config.YECC_CONNECT_TIMEOUT, config.YECC_READ_TIMEOUT)
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stats = {}
+    @property
+    def session(self):
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.YECC_POOL_SIZE, max_retries=0)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+                    self._pid = os.getpid()
+        return self._session
+    @staticmethod
+    def _endpoint_label(method, path):
+        segments = [
+            "{id}" if re.fullmatch(r"\d+|[A-Za-z0-9_-]{16,}", segment) else segment
+            for segment in path.strip("/").split("/")
+        ]
+        return f"{method} /{'/'.join(segments)}"
+    def _record(self, label, elapsed_ms, failed, retries):
+        with self._lock:
+            stats = self._stats.setdefault(label, {"calls": 0, "errors": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["calls"] += 1
+            stats["errors"] += int(failed)
+            stats["retries"] += retries
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+    def get_stats(self):
+        with self._lock:
+            return {
+                label: {**stats, "avg_ms": round(stats["total_ms"] / stats["calls"], 1) if stats["calls"] else 0.0,
+                        "total_ms": round(stats["total_ms"], 1), "max_ms": round(stats["max_ms"], 1)}
+                for label, stats in self._stats.items()
+            }
+    @staticmethod
+    def _backoff(attempt, response=None):
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), config.YECC_BACKOFF_MAX)
+        return random.uniform(0, min(config.YECC_BACKOFF_MAX, config.YECC_BACKOFF_BASE * (2 ** attempt)))
+    def request(self, method, path, headers=None, json=None, timeout=None, idempotent=None):
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        label = self._endpoint_label(method, path)
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, headers=headers, json=json, timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                safe_to_retry = idempotent or isinstance(e, requests.ConnectTimeout)
+                if attempt < config.YECC_MAX_RETRIES and safe_to_retry:
+                    delay = self._backoff(attempt)
+                    print(f"   ↻ {label} failed ({e.__class__.__name__}), retrying in {delay:.2f}s...")
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                self._record(label, (time.perf_counter() - started) * 1000, True, attempt)
+                raise
+            retryable = response.status_code in RETRY_STATUSES and (idempotent or response.status_code == 429)
+            if retryable and attempt < config.YECC_MAX_RETRIES:
+                delay = self._backoff(attempt, response)
+                print(f"   ↻ {label} returned {response.status_code}, retrying in {delay:.2f}s...")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._record(label, (time.perf_counter() - started) * 1000, response.status_code >= 400, attempt)
+            return response
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+yecc_client = YeccClient()
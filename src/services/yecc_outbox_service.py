@@ -0,0 +1,65 @@
+import os
+import threading
+from src.config import config
+from src.repositories import outbox_repository
+from src.services.yecc_service import sync_to_yecc_api
+SYNCED_SECTIONS = ("ok", "skipped")
+class YeccOutboxDispatcher:
+    def __init__(self, repository=None, workers=None):
+        self.repository = repository or outbox_repository
+        self.workers = workers or config.YECC_OUTBOX_WORKERS
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+    def start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._wakeup = threading.Event()
+            for idx in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"yecc-outbox-{idx}", daemon=True)
+                thread.start()
+        print(f"📮 Started {self.workers} YECC outbox dispatchers (PID {self._pid})")
+    def notify(self):
+        self._wakeup.set()
+    def get_counts(self):
+        return self.repository.get_counts()
+    def get_status(self, resume_id):
+        return self.repository.get_latest(resume_id)
+    def _worker_loop(self):
+        while True:
+            try:
+                entry = self.repository.claim_next(config.YECC_OUTBOX_STALE_SECONDS)
+            except Exception as e:
+                print(f"⚠️ Outbox claim failed: {e}")
+                entry = None
+            if not entry:
+                self._wakeup.wait(config.YECC_OUTBOX_POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+            self._dispatch(entry)
+    def _dispatch(self, entry):
+        print(f"\n📮 Dispatching YECC sync for resume {entry['resume_id']} (attempt {entry['attempts']})")
+        sections = None
+        try:
+            yecc_result = sync_to_yecc_api(entry['payload'])
+            if not yecc_result:
+                raise Exception("YECC sync returned no result")
+            sections = yecc_result.get('sections')
+            unsynced = [f"{section} {status}" for section, status in (sections or {}).items() if status not in SYNCED_SECTIONS]
+            if unsynced:
+                raise Exception(f"Sections not synced: {', '.join(unsynced)}")
+            self.repository.complete(entry['id'], entry['resume_id'], yecc_result)
+            print(f"✅ YECC sync stored for resume {entry['resume_id']}")
+        except Exception as e:
+            try:
+                dead = self.repository.fail(entry['id'], entry['attempts'], str(e), sections)
+            except Exception as db_error:
+                print(f"⚠️ Outbox failure update failed: {db_error}")
+                return
+            if dead:
+                print(f"☠️ YECC sync for resume {entry['resume_id']} moved to dead letter: {e}")
+            else:
+                print(f"⚠️ YECC sync for resume {entry['resume_id']} will be retried: {e}")
+yecc_outbox_dispatcher = YeccOutboxDispatcher()
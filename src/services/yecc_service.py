@@ -1,21 +1,19 @@
 import json
-import requests
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait
 from src.config import config
+from src.repositories.yecc_identity_repository import yecc_identity_repository
+from src.services.yecc_client import yecc_client
+from src.services.yecc_catalog_service import normalize_title, yecc_catalog_service
 
-YECC_BASE_URL = config.YECC_BASE_URL
 YECC_HEADERS = config.get_yecc_headers()
+SECTION_EXECUTOR = ThreadPoolExecutor(max_workers=config.YECC_SECTION_WORKERS, thread_name_prefix="yecc-section")
 
-def _get_lookup_id(endpoint, match_text, key_field="Title"):
+def _get_lookup_id(endpoint, match_text):
     try:
-        res = requests.get(f"{YECC_BASE_URL}/{endpoint}", headers=YECC_HEADERS, timeout=30)
-        if res.status_code != 200:
-            return None
-        items = res.json().get("data", [])
-        for item in items:
-            if match_text.lower() in item.get(key_field, "").lower():
-                return item.get("ID")
-        return items[0].get("ID") if items else None
+        catalog = yecc_catalog_service.get(endpoint, YECC_HEADERS)
+        item = catalog.find_containing(match_text) or catalog.first()
+        return item.get("ID") if item else None
     except Exception:
         return None
 
@@ -37,6 +35,111 @@ def _generate_placeholder_phone(email, name):
     return placeholder
 
 
+def _identity_keys(email, phone):
+    keys = []
+    if email:
+        keys.append(f"email:{email.strip().lower()}")
+    if phone:
+        keys.append(f"phone:{phone}")
+    return keys
+
+
+def _payload_hash(parsed_data):
+    payload = {key: value for key, value in parsed_data.items() if not key.startswith("_")}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _claim_identity(identity_keys, user_payload):
+    created = []
+    def create():
+        user_id, user_token = _create_user(user_payload)
+        if not user_id:
+            return None
+        created.append({"user_id": str(user_id), "user_token": user_token, "resume_url": None, "payload_hash": None})
+        return created[0]
+    try:
+        return yecc_identity_repository.find_or_create(identity_keys, create)
+    except Exception as e:
+        print(f"⚠️ YECC identity lookup failed: {e}")
+    # The user may already exist in YECC even though storing the identity failed
+    return created[0] if created else create()
+
+
+def _remember_identity(identity_keys, user_id, user_token, resume_url, payload_hash):
+    try:
+        yecc_identity_repository.remember(identity_keys, user_id, user_token, resume_url, payload_hash)
+    except Exception as e:
+        print(f"⚠️ Failed to store YECC identity: {e}")
+
+
+def _user_headers(user_token):
+    if user_token:
+        print(f"🔑 Using user's token for resume builder calls...")
+        user_headers = YECC_HEADERS.copy()
+        user_headers["Authorization"] = user_token
+        return user_headers
+    print("⚠️ No user token available, using admin token...")
+    return YECC_HEADERS
+
+
+def _sync_result(user_id, resume_url, sections):
+    return {
+        "user_id": user_id,
+        "resume_url": resume_url,
+        "yecc_profile_url": f"https://beta.yecc.tech/Resume/{resume_url}",
+        "sections": sections
+    }
+
+
+def _create_user(user_payload):
+    print("📤 Step 1: Creating user...")
+    res = yecc_client.post("users", headers=YECC_HEADERS, json=user_payload)
+    print(f"Response ({res.status_code}): {res.text}")
+    if res.status_code != 200:
+        print("⚠️ User creation failed.")
+        return None, None
+
+    response_data = res.json().get("data", {})
+    user_id = response_data.get("UserID")
+    user_token = response_data.get("token")
+    
+    if not user_id:
+        print("⚠️ No UserID in response.")
+        return None, None
+    print(f"✅ User created with UserID: {user_id}")
+    return user_id, user_token
+
+
+def _create_resume_url(user_id, user_headers):
+    print(f"\n📤 Step 2: Generating resume URL for UserID {user_id}...")
+    res = yecc_client.post(
+        f"ResumeBuilder/generateResumeUrl/{user_id}",
+        headers=user_headers
+    )
+    print(f"Response ({res.status_code}): {res.text}")
+    if res.status_code != 200:
+        print("⚠️ Resume URL generation failed.")
+        return None
+
+    resume_url = res.json().get("data")
+    if not resume_url:
+        print("⚠️ No resume URL in response.")
+        return None
+    print(f"✅ Resume URL generated: {resume_url}")
+
+    print(f"\n📡 Initializing resume data for URL: {resume_url}")
+    init_res = yecc_client.get(
+        f"ResumeBuilder/{resume_url}",
+        headers=user_headers
+    )
+    print(f"Initialization Response: {init_res.status_code} {init_res.text[:200]}")
+    if init_res.status_code != 200:
+        print("⚠️ Resume initialization failed. PUT calls may not work correctly.")
+    else:
+        print("✅ Resume context initialized successfully.")
+    return resume_url
+
+
 def sync_to_yecc_api(parsed_data):
     try:
         print("\n🔄 Syncing to YECC API...")
@@ -79,58 +182,26 @@ def sync_to_yecc_api(parsed_data):
             "isGetUSERID": True
         }
 
-        print("📤 Step 1: Creating user...")
-        res = requests.post(f"{YECC_BASE_URL}/users", headers=YECC_HEADERS, json=user_payload, timeout=30)
-        print(f"Response ({res.status_code}): {res.text}")
-        if res.status_code != 200:
-            print("⚠️ User creation failed.")
-            return None
-
-        response_data = res.json().get("data", {})
-        user_id = response_data.get("UserID")
-        user_token = response_data.get("token")
-        
-        if not user_id:
-            print("⚠️ No UserID in response.")
-            return None
-        print(f"✅ User created with UserID: {user_id}")
-        
-        if user_token:
-            print(f"🔑 Using user's token for resume builder calls...")
-            user_headers = YECC_HEADERS.copy()
-            user_headers["Authorization"] = user_token
-        else:
-            print("⚠️ No user token returned, using admin token...")
-            user_headers = YECC_HEADERS
-
-        print(f"\n📤 Step 2: Generating resume URL for UserID {user_id}...")
-        res = requests.post(
-            f"{YECC_BASE_URL}/ResumeBuilder/generateResumeUrl/{user_id}",
-            headers=user_headers,
-            timeout=30
-        )
-        print(f"Response ({res.status_code}): {res.text}")
-        if res.status_code != 200:
-            print("⚠️ Resume URL generation failed.")
-            return None
-
-        resume_url = res.json().get("data")
-        if not resume_url:
-            print("⚠️ No resume URL in response.")
+        identity_keys = _identity_keys(email, phone_cleaned)
+        payload_hash = _payload_hash(parsed_data)
+        identity = _claim_identity(identity_keys, user_payload)
+        if not identity:
             return None
-        print(f"✅ Resume URL generated: {resume_url}")
-
-        print(f"\n📡 Initializing resume data for URL: {resume_url}")
-        init_res = requests.get(
-            f"{YECC_BASE_URL}/ResumeBuilder/{resume_url}",
-            headers=user_headers,
-            timeout=30
-        )
-        print(f"Initialization Response: {init_res.status_code} {init_res.text[:200]}")
-        if init_res.status_code != 200:
-            print("⚠️ Resume initialization failed. PUT calls may not work correctly.")
+        if identity["payload_hash"] == payload_hash:
+            print(f"⏭️ YECC profile for UserID {identity['user_id']} is already up to date, skipping sync.")
+            return _sync_result(identity["user_id"], identity["resume_url"], {})
+
+        user_id = identity["user_id"]
+        user_token = identity["user_token"]
+        resume_url = identity["resume_url"]
+        user_headers = _user_headers(user_token)
+        if resume_url:
+            print(f"♻️ Reusing YECC UserID {user_id} and resume URL {resume_url}")
         else:
-            print("✅ Resume context initialized successfully.")
+            resume_url = _create_resume_url(user_id, user_headers)
+            if not resume_url:
+                return None
+            _remember_identity(identity_keys, user_id, user_token, resume_url, None)
 
         print("\n📡 Fetching reference IDs...")
         lookups = {
@@ -146,25 +217,44 @@ def sync_to_yecc_api(parsed_data):
         print(f"✅ Lookup IDs: {json.dumps(lookups, indent=2)}")
 
         print("\n📤 Step 5: Updating resume sections...")
-        _update_personal_info(parsed_data, resume_url, user_payload, lookups, user_headers)
-        _update_skills(parsed_data, resume_url, lookups, user_headers)
-        _update_experience(parsed_data, resume_url, lookups, user_headers)
-        _update_erp_projects(parsed_data, resume_url, lookups, user_headers)
-        _update_education(parsed_data, resume_url, lookups, user_headers)
-        _update_certifications(parsed_data, resume_url, user_headers)
-
-        print("✅ YECC sync complete!")
-        return {
-            "user_id": user_id,
-            "resume_url": resume_url,
-            "yecc_profile_url": f"https://beta.yecc.tech/Resume/{resume_url}"
-        }
+        sections = _update_sections(parsed_data, resume_url, user_payload, lookups, user_headers)
+
+        synced = all(status in ("ok", "skipped") for status in sections.values())
+        _remember_identity(identity_keys, user_id, user_token, resume_url, payload_hash if synced else None)
+
+        print(f"✅ YECC sync complete! Sections: {json.dumps(sections)}")
+        return _sync_result(user_id, resume_url, sections)
 
     except Exception as e:
         print(f"⚠️ YECC sync error: {e}")
         return None
 
 
+def _update_sections(parsed_data, resume_url, user_payload, lookups, headers):
+    updates = {
+        "personal_info": (_update_personal_info, (parsed_data, resume_url, user_payload, lookups, headers)),
+        "skills": (_update_skills, (parsed_data, resume_url, lookups, headers)),
+        "experience": (_update_experience, (parsed_data, resume_url, lookups, headers)),
+        "erp_projects": (_update_erp_projects, (parsed_data, resume_url, lookups, headers)),
+        "education": (_update_education, (parsed_data, resume_url, lookups, headers)),
+        "certifications": (_update_certifications, (parsed_data, resume_url, headers))
+    }
+    futures = {SECTION_EXECUTOR.submit(func, *args): section for section, (func, args) in updates.items()}
+    done, not_done = wait(futures, timeout=config.YECC_SYNC_DEADLINE)
+    sections = {}
+    for future, section in futures.items():
+        if future in not_done:
+            sections[section] = "not_started" if future.cancel() else "unknown"
+        elif future.exception() is not None:
+            sections[section] = "failed"
+        else:
+            result = future.result()
+            sections[section] = "skipped" if result is None else "ok" if result else "failed"
+    if not_done:
+        print(f"   ⏱️ {len(not_done)} section update(s) exceeded the {config.YECC_SYNC_DEADLINE}s sync deadline")
+    return sections
+
+
 def _update_personal_info(parsed_data, resume_url, user_payload, lookups, headers):
     try:
         phone_raw = parsed_data.get("phone", "") or ""
@@ -194,11 +284,13 @@ def _update_personal_info(parsed_data, resume_url, user_payload, lookups, header
         }
 
         print("   → Updating personal info...")
-        res = requests.put(f"{YECC_BASE_URL}/ResumeBuilder/PersonalInfo/{resume_url}",
-                           headers=headers, json=personal_info_payload, timeout=30)
+        res = yecc_client.put(f"ResumeBuilder/PersonalInfo/{resume_url}",
+                              headers=headers, json=personal_info_payload)
         print(f"   Response: {res.status_code} {res.text[:200]}")
+        return res.status_code == 200
     except Exception as e:
         print(f"   ⚠️ Personal info error: {e}")
+        return False
 
 
 def _update_skills(parsed_data, resume_url, lookups, headers):
@@ -221,11 +313,13 @@ def _update_skills(parsed_data, resume_url, lookups, headers):
         payload = {"Skills": skills, "Languages": [{"Title": "English", "LanguageID": lookups["lang_id"]}]}
 
         print(f"   → Updating skills ({len(skills)} skills)...")
-        res = requests.put(f"{YECC_BASE_URL}/ResumeBuilder/ContactInfo/{resume_url}",
-                           headers=headers, json=payload, timeout=30)
+        res = yecc_client.put(f"ResumeBuilder/ContactInfo/{resume_url}",
+                              headers=headers, json=payload)
         print(f"   Response: {res.status_code} {res.text[:200]}")
+        return res.status_code == 200
     except Exception as e:
         print(f"   ⚠️ Skills error: {e}")
+        return False
 
 
 def _update_experience(parsed_data, resume_url, lookups, headers):
@@ -314,11 +408,13 @@ def _update_experience(parsed_data, resume_url, lookups, headers):
             print("   ⚠️ No experience data to update.")
             return
         print(f"   → Updating experience ({len(exps)} entries)...")
-        res = requests.put(f"{YECC_BASE_URL}/ResumeBuilder/Experiences/{resume_url}",
-                           headers=headers, json=exps, timeout=30)
+        res = yecc_client.put(f"ResumeBuilder/Experiences/{resume_url}",
+                              headers=headers, json=exps)
         print(f"   Response: {res.status_code} {res.text[:200]}")
+        return res.status_code == 200
     except Exception as e:
         print(f"   ⚠️ Experience error: {e}")
+        return False
 
 
 def _update_education(parsed_data, resume_url, lookups, headers):
@@ -346,11 +442,10 @@ def _update_education(parsed_data, resume_url, lookups, headers):
         payload = {"EducationCertifications": educations}
 
         print(f"   → Updating education ({len(educations)} entries)...")
-        res = requests.put(
-            f"{YECC_BASE_URL}/ResumeBuilder/EducationCertifications/{resume_url}",
+        res = yecc_client.put(
+            f"ResumeBuilder/EducationCertifications/{resume_url}",
             headers=headers,
-            json=payload,
-            timeout=30
+            json=payload
         )
         print(f"   Response: {res.status_code} {res.text[:200]}")
 
@@ -385,11 +480,13 @@ def _update_education(parsed_data, resume_url, lookups, headers):
             print("   ⚠️ No education data to update.")
             return
         print(f"   → Updating education ({len(edus)} entries)...")
-        res = requests.put(f"{YECC_BASE_URL}/ResumeBuilder/EducationCertifications/{resume_url}",
-                           headers=headers, json=edus, timeout=30)
+        res = yecc_client.put(f"ResumeBuilder/EducationCertifications/{resume_url}",
+                              headers=headers, json=edus)
         print(f"   Response: {res.status_code} {res.text[:200]}")
+        return res.status_code == 200
     except Exception as e:
         print(f"   ⚠️ Education error: {e}")
+        return False
 
 
 def _update_certifications(parsed_data, resume_url, headers):
@@ -412,94 +509,69 @@ def _update_certifications(parsed_data, resume_url, headers):
             print("   ⚠️ No certifications to update.")
             return
         print(f"   → Updating certifications ({len(certs)} entries)...")
-        res = requests.put(f"{YECC_BASE_URL}/ResumeBuilder/Certifications/{resume_url}",
-                           headers=headers, json=certs, timeout=30)
+        res = yecc_client.put(f"ResumeBuilder/Certifications/{resume_url}",
+                              headers=headers, json=certs)
         print(f"   Response: {res.status_code} {res.text[:200]}")
+        return res.status_code == 200
     except Exception as e:
         print(f"   ⚠️ Certifications error: {e}")
+        return False
+
 
+TRACK_ALIASES = {"scm": "supply chain", "fin": "financ", "hcm": "human capital"}
 
 def _get_track_id(headers, track_name):
     try:
-        res = requests.get(f"{YECC_BASE_URL}/resumeTrack", headers=headers, timeout=10)
-        if res.status_code == 200:
-            tracks = res.json().get("data", [])
-            track_lower = track_name.lower() if track_name else ""
-            for t in tracks:
-                title = t.get("Title", "").lower()
-                if track_lower in title or (track_lower == "scm" and "supply chain" in title):
-                    return t.get("ID")
-                if track_lower == "fin" and "financ" in title:
-                    return t.get("ID")
-                if track_lower == "hcm" and "human capital" in title:
-                    return t.get("ID")
-            return tracks[0].get("ID") if tracks else "1"
+        tracks = yecc_catalog_service.get("resumeTrack", headers)
+        track_lower = normalize_title(track_name)
+        aliases = [TRACK_ALIASES[track_lower]] if track_lower in TRACK_ALIASES else []
+        track = tracks.find_containing(track_lower, *aliases) or tracks.first()
+        return track.get("ID") if track else "1"
     except:
         pass
     return "1"
 
 def _get_product_id(headers, product_name):
     try:
-        res = requests.get(f"{YECC_BASE_URL}/resumeProduct", headers=headers, timeout=10)
-        if res.status_code == 200:
-            products = res.json().get("data", [])
-            product_lower = product_name.lower() if product_name else ""
-            for p in products:
-                title = p.get("Title", "").lower()
-                if product_lower and product_lower in title:
-                    return p.get("ID")
-                if "oracle" in product_lower and "oracle" in title:
-                    return p.get("ID")
-            return products[0].get("ID") if products else "1"
+        products = yecc_catalog_service.get("resumeProduct", headers)
+        product_lower = normalize_title(product_name)
+        needles = ([product_lower] if product_lower else []) + (["oracle"] if "oracle" in product_lower else [])
+        product = products.find_containing(*needles) or products.first()
+        return product.get("ID") if product else "1"
     except:
         pass
     return "1"
 
 def _get_module_objects(headers, module_names, track_id, product_id):
     try:
-        res = requests.get(f"{YECC_BASE_URL}/resumeModules", headers=headers, timeout=10)
-        if res.status_code == 200:
-            all_modules = res.json().get("data", [])
-            matched = []
-            for mod_name in module_names:
-                mod_lower = mod_name.lower() if mod_name else ""
-                for m in all_modules:
-                    title = m.get("Title", "").lower()
-                    if mod_lower in title or title in mod_lower:
-                        matched.append({
-                            "Title": m.get("Title"),
-                            "ModuleID": m.get("ID")
-                        })
-                        break
-            return matched if matched else [{"Title": module_names[0], "ModuleID": None}] if module_names else []
+        all_modules = yecc_catalog_service.get("resumeModules", headers)
+        matched = []
+        for mod_name in module_names:
+            m = all_modules.find_overlapping(mod_name)
+            if m:
+                matched.append({
+                    "Title": m.get("Title"),
+                    "ModuleID": m.get("ID")
+                })
+        return matched if matched else [{"Title": module_names[0], "ModuleID": None}] if module_names else []
     except:
         pass
     return [{"Title": m, "ModuleID": None} for m in module_names] if module_names else []
 
 def _get_domain_id(headers, domain_name):
     try:
-        res = requests.get(f"{YECC_BASE_URL}/resumeDomain", headers=headers, timeout=10)
-        if res.status_code == 200:
-            domains = res.json().get("data", [])
-            domain_lower = domain_name.lower() if domain_name else ""
-            for d in domains:
-                if domain_lower in d.get("Title", "").lower():
-                    return d.get("ID")
-            return domains[0].get("ID") if domains else None
+        domains = yecc_catalog_service.get("resumeDomain", headers)
+        domain = domains.find_containing(domain_name) or domains.first()
+        return domain.get("ID") if domain else None
     except:
         pass
     return None
 
 def _get_role_id(headers, role_name):
     try:
-        res = requests.get(f"{YECC_BASE_URL}/resumeRole", headers=headers, timeout=10)
-        if res.status_code == 200:
-            roles = res.json().get("data", [])
-            role_lower = role_name.lower() if role_name else ""
-            for r in roles:
-                if role_lower in r.get("Title", "").lower() or "consultant" in r.get("Title", "").lower():
-                    return r.get("ID")
-            return roles[0].get("ID") if roles else None
+        roles = yecc_catalog_service.get("resumeRole", headers)
+        role = roles.find_containing(role_name, "consultant") or roles.first()
+        return role.get("ID") if role else None
     except:
         pass
     return None
@@ -609,19 +681,21 @@ def _update_erp_projects(parsed_data, resume_url, lookups, headers):
         print(f"   → Updating ERP projects ({len(projects)} entries)...")
         print(f"   Payload sample: {json.dumps(projects[0], indent=2)[:800]}")
         
-        res = requests.put(f"{YECC_BASE_URL}/ResumeBuilder/ProjectExperiences/{resume_url}",
-                           headers=headers, json=projects, timeout=30)
+        res = yecc_client.put(f"ResumeBuilder/ProjectExperiences/{resume_url}",
+                              headers=headers, json=projects)
         print(f"   ProjectExperiences Response: {res.status_code} {res.text[:300]}")
         
         if res.status_code == 200:
             print("   ✅ Projects updated successfully!")
         else:
             print(f"   ⚠️ Projects update failed: {res.text[:200]}")
+        return res.status_code == 200
         
     except Exception as e:
         import traceback
         print(f"   ⚠️ ERP Projects error: {e}")
         traceback.print_exc()
+        return False
 
 def import_time():
     import time
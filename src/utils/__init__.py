@@ -1,2 +1,12 @@
-from .file_handler import allowed_file, extract_text_from_pdf, extract_text_from_docx, extract_text
+from .file_handler import allowed_file, extract_text_from_pdf, extract_text_from_docx, extract_text, extract_text_from_bytes
 from .helpers import clean_array, extract_email, extract_phone, extract_linkedin, safe_join
+from .lru_cache import LRUCache
+from .pdf_extractor import PdfExtractor, pdf_extractor
+from .docx_extractor import iter_docx_lines, extract_docx_text
+from .extraction_sandbox import ExtractionSandbox, extraction_sandbox, sandboxed_extract_text
+from .fact_extractor import FactExtractor, fact_extractor
+from .latency_histogram import LatencyHistogram
+from .circuit_breaker import CircuitBreaker
+from .token_bucket import TokenBucket
+from .streaming_json import FieldStream, StreamingJsonParser
+from .json_repair import JsonRepairer, is_truncated, repair_json, strip_wrappers
@@ -0,0 +1,54 @@
+from collections import deque
+class AhoCorasick:
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern, value in patterns.items():
+            self._add(pattern.lower(), value)
+        self._build()
+    def _add(self, pattern, value):
+        state = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        self.output[state].append((len(pattern), value))
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+    def iter_matches(self, text):
+        state = 0
+        for end, char in enumerate(text, 1):
+            char = char.lower()
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, value in self.output[state]:
+                yield end - length, end, value
+    def find_words(self, text):
+        matches = []
+        for start, end, value in self.iter_matches(text):
+            if (start and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()):
+                continue
+            matches.append((start, end, value))
+        return matches
+def longest_matches(matches):
+    selected = []
+    last_end = 0
+    for start, end, value in sorted(matches, key=lambda match: (match[0], match[0] - match[1])):
+        if start >= last_end:
+            selected.append((start, end, value))
+            last_end = end
+    return selected
@@ -0,0 +1,96 @@
+import random
+import threading
+import time
+from collections import deque
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+class CircuitBreaker:
+    def __init__(self, name, window=20, min_calls=5, error_rate=0.5, slow_call_seconds=None, slow_call_rate=0.8, open_seconds=30, max_open_seconds=300, half_open_calls=1):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self.opened_until = 0
+        self.trips = 0
+        self._consecutive_trips = 0
+        self._outcomes = deque(maxlen=window)
+        self._half_open_in_flight = 0
+        self._lock = threading.Lock()
+    def allow(self):
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() < self.opened_until:
+                    return False
+                self.state = HALF_OPEN
+                self._half_open_in_flight = 0
+                print(f"🔌 {self.name} circuit half-open, sending a trial call")
+            if self.state == HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_calls:
+                    return False
+                self._half_open_in_flight += 1
+            return True
+    def record_success(self, latency=None):
+        slow = bool(self.slow_call_seconds and latency is not None and latency > self.slow_call_seconds)
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._half_open_in_flight -= 1
+                if slow:
+                    self._trip(None)
+                    return
+                self.state = CLOSED
+                self._consecutive_trips = 0
+                self._outcomes.clear()
+                print(f"🔌 {self.name} circuit closed")
+                return
+            self._outcomes.append((False, slow))
+            self._evaluate()
+    def release(self):
+        with self._lock:
+            if self.state == HALF_OPEN and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+    def record_failure(self, retry_after=None):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._half_open_in_flight -= 1
+                self._trip(retry_after)
+                return
+            self._outcomes.append((True, False))
+            if retry_after:
+                self._trip(retry_after)
+                return
+            self._evaluate()
+    def _evaluate(self):
+        if self.state != CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        errors = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, is_slow in self._outcomes if is_slow)
+        if errors / len(self._outcomes) >= self.error_rate or slow / len(self._outcomes) >= self.slow_call_rate:
+            self._trip(None)
+    def _trip(self, retry_after):
+        self._consecutive_trips += 1
+        backoff = min(self.max_open_seconds, self.open_seconds * (2 ** (self._consecutive_trips - 1)))
+        duration = max(retry_after or 0, random.uniform(backoff / 2, backoff))
+        self.state = OPEN
+        self.opened_until = time.monotonic() + duration
+        self.trips += 1
+        self._outcomes.clear()
+        print(f"🔌 {self.name} circuit open for {duration:.1f}s")
+    def retry_in(self):
+        with self._lock:
+            return max(0, self.opened_until - time.monotonic()) if self.state == OPEN else 0
+    def snapshot(self):
+        with self._lock:
+            errors = sum(1 for failed, _ in self._outcomes if failed)
+            return {
+                'state': self.state,
+                'trips': self.trips,
+                'recent_calls': len(self._outcomes),
+                'recent_errors': errors,
+                'retry_in': round(max(0, self.opened_until - time.monotonic()), 1) if self.state == OPEN else 0
+            }
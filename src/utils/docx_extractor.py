@@ -0,0 +1,66 @@
+import zipfile
+from xml.etree.ElementTree import iterparse
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+BREAKS = {W + "br": "\n", W + "cr": "\n", W + "tab": "\t"}
+CELL_SEPARATOR = " | "
+def iter_docx_lines(source):
+    with zipfile.ZipFile(source) as archive, archive.open("word/document.xml") as document:
+        paragraphs = []
+        cells = []
+        rows = []
+        skip_depth = 0
+        runs = 0
+        open_elems = []
+        for event, elem in iterparse(document, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                open_elems.append(elem)
+            else:
+                open_elems.pop()
+            if tag == MC_FALLBACK:
+                skip_depth += 1 if event == "start" else -1
+                if event == "end":
+                    elem.clear()
+                continue
+            if skip_depth:
+                continue
+            if event == "start":
+                if tag == W + "p":
+                    paragraphs.append([])
+                elif tag == W + "tc":
+                    cells.append([])
+                elif tag == W + "tr":
+                    rows.append([])
+                elif tag == W + "r":
+                    runs += 1
+                continue
+            if tag == W + "t":
+                if paragraphs:
+                    paragraphs[-1].append(elem.text or "")
+            elif tag == W + "r":
+                runs -= 1
+            elif tag in BREAKS:
+                if paragraphs and runs:
+                    paragraphs[-1].append(BREAKS[tag])
+            elif tag == W + "p":
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text
+                    elem.clear()
+                    open_elems[-1].remove(elem)
+            elif tag == W + "tc":
+                rows[-1].append(" ".join(text.strip() for text in cells.pop() if text.strip()))
+            elif tag == W + "tr":
+                row = CELL_SEPARATOR.join(cell for cell in rows.pop() if cell)
+                if cells:
+                    cells[-1].append(row)
+                elif row:
+                    yield row
+            elif tag == W + "tbl" and not cells:
+                elem.clear()
+                open_elems[-1].remove(elem)
+def extract_docx_text(source):
+    return "\n".join(iter_docx_lines(source)).strip()
@@ -0,0 +1,142 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Connection
+from src.config import config
+from src.utils.file_handler import extract_text_from_bytes
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+class SandboxWorker:
+    def __init__(self):
+        parent_sock, child_sock = socket.socketpair()
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get("PYTHONPATH")])))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "src.utils.sandbox_worker", str(child_sock.fileno())],
+            pass_fds=(child_sock.fileno(),),
+            env=env,
+            start_new_session=True
+        )
+        child_sock.close()
+        self.conn = Connection(parent_sock.detach())
+        self.documents = 0
+        self.broken = False
+    def _pids(self):
+        pids = [self.process.pid]
+        for pid in pids:
+            try:
+                for task in os.listdir(f"/proc/{pid}/task"):
+                    with open(f"/proc/{pid}/task/{task}/children") as f:
+                        pids.extend(int(child) for child in f.read().split())
+            except (OSError, ValueError):
+                continue
+        return pids
+    def rss(self):
+        total = 0
+        for pid in self._pids():
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    total += int(f.read().split()[1]) * PAGE_SIZE
+            except (OSError, ValueError, IndexError):
+                continue
+        return total
+    def run(self, file_bytes, filename, timeout, max_rss, parallel=True):
+        self.documents += 1
+        deadline = time.monotonic() + timeout
+        try:
+            self.conn.send((file_bytes, filename, parallel))
+            while not self.conn.poll(config.EXTRACT_SANDBOX_POLL_INTERVAL):
+                if self.process.poll() is not None:
+                    raise Exception("Extraction worker crashed")
+                if time.monotonic() > deadline:
+                    raise Exception(f"Text extraction timed out after {timeout:g}s")
+                rss = self.rss()
+                if max_rss and rss > max_rss:
+                    raise Exception(f"Text extraction exceeded the memory limit ({rss // (1024 * 1024)} MB)")
+            ok, payload = self.conn.recv()
+        except (EOFError, OSError):
+            self.broken = True
+            raise Exception("Extraction worker crashed")
+        except Exception:
+            self.broken = True
+            raise
+        if not ok:
+            raise Exception(payload)
+        return payload
+    def _kill(self):
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        self.process.wait()
+    def stop(self):
+        if self.broken:
+            self._kill()
+        else:
+            try:
+                self.conn.send(None)
+                self.process.wait(timeout=1)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                pass
+            self._kill()
+        self.conn.close()
+class ExtractionSandbox:
+    def __init__(self, workers=None):
+        self.size = workers or config.EXTRACT_SANDBOX_WORKERS
+        self.recycled = 0
+        self._idle = []
+        self._slots = None
+        self._pid = None
+        self._lock = threading.Lock()
+    def _ensure_pool(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._idle = []
+                self._slots = threading.BoundedSemaphore(self.size)
+                self._pid = os.getpid()
+            return self._slots
+    def extract(self, file_bytes, filename, parallel=True):
+        slots = self._ensure_pool()
+        if not slots.acquire(timeout=config.EXTRACT_SANDBOX_QUEUE_TIMEOUT):
+            raise Exception("All extraction workers are busy, try again later")
+        worker = None
+        try:
+            worker = self._checkout()
+            return worker.run(file_bytes, filename, config.EXTRACT_TIMEOUT, config.EXTRACT_MAX_RSS_MB * 1024 * 1024, parallel)
+        finally:
+            if worker:
+                self._checkin(worker)
+            slots.release()
+    def _checkout(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return SandboxWorker()
+    def _checkin(self, worker):
+        if not worker.broken and worker.documents < config.EXTRACT_SANDBOX_MAX_DOCUMENTS:
+            with self._lock:
+                self._idle.append(worker)
+            return
+        if worker.broken:
+            print(f"♻️ Killing extraction worker {worker.process.pid} after a limit breach")
+        worker.stop()
+        replacement = SandboxWorker()
+        with self._lock:
+            self.recycled += 1
+            self._idle.append(replacement)
+    def get_stats(self):
+        with self._lock:
+            return {'workers': self.size, 'idle': len(self._idle), 'recycled': self.recycled, 'enabled': config.EXTRACT_SANDBOX_ENABLED}
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+extraction_sandbox = ExtractionSandbox()
+def sandboxed_extract_text(file_bytes, filename, parallel=True):
+    if not config.EXTRACT_SANDBOX_ENABLED:
+        return extract_text_from_bytes(file_bytes, filename)
+    return extraction_sandbox.extract(file_bytes, filename, parallel)
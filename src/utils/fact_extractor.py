@@ -0,0 +1,38 @@
+import hashlib
+import os
+import json
+from src.utils.aho_corasick import AhoCorasick, longest_matches
+from src.utils.helpers import extract_email, extract_phone, extract_linkedin
+CONTACT_EXTRACTORS = {"email": extract_email, "phone": extract_phone, "linkedin": extract_linkedin}
+class FactExtractor:
+    def __init__(self, vocabulary_path=None):
+        vocabulary_path = vocabulary_path or os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'erp_vocabulary.json')
+        with open(vocabulary_path, 'r') as f:
+            raw = f.read()
+        self.vocabulary = json.loads(raw)
+        self.version = hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
+        self.list_fields = list(self.vocabulary)
+        self.automaton = AhoCorasick({
+            alias: (field, canonical)
+            for field, terms in self.vocabulary.items()
+            for canonical, aliases in terms.items()
+            for alias in aliases + [canonical]
+        })
+    def extract(self, text):
+        facts = {}
+        for field, extractor in CONTACT_EXTRACTORS.items():
+            value = extractor(text)
+            if value:
+                facts[field] = value
+        by_field = {}
+        for start, end, (field, canonical) in self.automaton.find_words(text):
+            by_field.setdefault(field, []).append((start, end, canonical))
+        for field in self.list_fields:
+            found = []
+            for _, _, canonical in longest_matches(by_field.get(field, [])):
+                if canonical not in found:
+                    found.append(canonical)
+            if found:
+                facts[field] = found
+        return facts
+fact_extractor = FactExtractor()
@@ -1,24 +1,18 @@
-import re
-import pdfplumber
-from docx import Document
+import io
 from src.config import config
+from src.utils.docx_extractor import extract_docx_text
+from src.utils.pdf_extractor import pdf_extractor
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in config.ALLOWED_EXTENSIONS
-def extract_text_from_pdf(filepath):
-    text = ""
-    with pdfplumber.open(filepath) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text.strip()
-def extract_text_from_docx(filepath):
-    doc = Document(filepath)
-    text = ""
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text.strip()
-def extract_text(filepath, filename):
+def extract_text_from_pdf(source):
+    text, engine = pdf_extractor.extract(source)
+    print(f"📄 Extracted {len(text)} chars from PDF with {engine}")
+    return text
+def extract_text_from_docx(source):
+    return extract_docx_text(source)
+def extract_text(source, filename):
     if filename.lower().endswith(".pdf"):
-        return extract_text_from_pdf(filepath)
-    return extract_text_from_docx(filepath)
+        return extract_text_from_pdf(source)
+    return extract_text_from_docx(source)
+def extract_text_from_bytes(file_bytes, filename):
+    return extract_text(io.BytesIO(file_bytes), filename)
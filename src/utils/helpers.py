@@ -1,4 +1,12 @@
 import re
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+PHONE_PATTERNS = [
+    re.compile(r"\+?91[\s-]?\d{10}"),
+    re.compile(r"\d{10}"),
+    re.compile(r"\d{5}[\s-]?\d{5}"),
+]
+NON_DIGIT_PATTERN = re.compile(r"[^\d]")
+LINKEDIN_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+", re.IGNORECASE)
 def clean_array(arr):
     if not arr:
         return []
@@ -10,25 +18,18 @@ def clean_array(arr):
                 cleaned.append(clean_item)
     return cleaned
 def extract_email(text):
-    email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-    match = re.search(email_pattern, text)
+    match = EMAIL_PATTERN.search(text)
     return match.group(0) if match else None
 def extract_phone(text):
-    phone_patterns = [
-        r"\+?91[\s-]?\d{10}",
-        r"\d{10}",
-        r"\d{5}[\s-]?\d{5}",
-    ]
-    for pattern in phone_patterns:
-        match = re.search(pattern, text)
+    for pattern in PHONE_PATTERNS:
+        match = pattern.search(text)
         if match:
-            phone = re.sub(r"[^\d]", "", match.group(0))
+            phone = NON_DIGIT_PATTERN.sub("", match.group(0))
             if len(phone) >= 10:
                 return phone[-10:]
     return None
 def extract_linkedin(text):
-    linkedin_pattern = r"(?:https?://)?(?:www\.)?linkedin\.com/in/[a-zA-Z0-9_-]+"
-    match = re.search(linkedin_pattern, text, re.IGNORECASE)
+    match = LINKEDIN_PATTERN.search(text)
     return match.group(0) if match else None
 def safe_join(items, separator=", "):
     if not items:
@@ -0,0 +1,222 @@
+import json
+import re
+WHITESPACE = re.compile(r'\s*')
+NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+BARE_WORD = re.compile(r'[A-Za-z_$][\w$-]*')
+STRING_CHUNK = {'"': re.compile(r'[^"\\]*'), "'": re.compile(r"[^'\\]*")}
+CONTROL_CHARS = re.compile(r'[\x00-\x1f]')
+HEX_DIGITS = set('0123456789abcdefABCDEF')
+ESCAPES = {'"': '"', "'": "'", '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+LITERALS = {'true': True, 'false': False, 'null': None}
+PYTHON_LITERALS = {'True': True, 'False': False, 'None': None}
+FENCES = re.compile(r'```(?:json)?\s*')
+REASONING = re.compile(r'<(think|thinking)>.*?</\1>', re.DOTALL)
+DECODER = json.JSONDecoder()
+TRUNCATION_REPAIRS = ('closed unterminated', 'dropped incomplete')
+class Truncated(Exception):
+    pass
+class JsonRepairer:
+    def __init__(self, text, pos=0):
+        self.text = text
+        self.pos = pos
+        self.eof = False
+        self._repairs = {}
+    def repair(self, message):
+        self._repairs[message] = self._repairs.get(message, 0) + 1
+    @property
+    def repairs(self):
+        return [message if count == 1 else f"{message} (x{count})" for message, count in self._repairs.items()]
+    def _peek(self):
+        self.pos = WHITESPACE.match(self.text, self.pos).end()
+        if self.pos >= len(self.text):
+            self.eof = True
+            return ''
+        return self.text[self.pos]
+    def parse(self):
+        return self.parse_value()
+    def parse_value(self):
+        char = self._peek()
+        if char == '{':
+            return self.parse_object()
+        if char == '[':
+            return self.parse_array()
+        if char in ('"', "'"):
+            return self.parse_string()
+        if not char:
+            raise Truncated()
+        return self.parse_scalar()
+    def parse_scalar(self):
+        text = self.text
+        match = NUMBER.match(text, self.pos)
+        if match:
+            if match.end() >= len(text):
+                self.pos = len(text)
+                self.eof = True
+                raise Truncated()
+            self.pos = match.end()
+            number = match.group()
+            return float(number) if any(c in number for c in '.eE') else int(number)
+        match = BARE_WORD.match(text, self.pos)
+        word = match.group() if match else ''
+        if word in LITERALS:
+            self.pos = match.end()
+            return LITERALS[word]
+        if word in PYTHON_LITERALS:
+            self.pos = match.end()
+            self.repair("converted Python literal")
+            return PYTHON_LITERALS[word]
+        if word and match.end() >= len(text) and any(literal.startswith(word) for literal in LITERALS):
+            self.pos = len(text)
+            self.eof = True
+            raise Truncated()
+        raise ValueError(f"Unexpected character {text[self.pos]!r} at position {self.pos}")
+    def parse_string(self):
+        text = self.text
+        quote = text[self.pos]
+        if quote == "'":
+            self.repair("converted single-quoted string")
+        self.pos += 1
+        chunk = STRING_CHUNK[quote]
+        parts = []
+        surrogates = False
+        while True:
+            match = chunk.match(text, self.pos)
+            if CONTROL_CHARS.search(match.group()):
+                self.repair("kept raw control characters in string")
+            parts.append(match.group())
+            self.pos = match.end()
+            if self.pos >= len(text):
+                self.eof = True
+                self.repair("closed unterminated string")
+                break
+            if text[self.pos] == quote:
+                self.pos += 1
+                break
+            escape = text[self.pos + 1:self.pos + 2]
+            if not escape:
+                self.pos = len(text)
+                continue
+            if escape == 'u':
+                digits = text[self.pos + 2:self.pos + 6]
+                if len(digits) == 4 and set(digits) <= HEX_DIGITS:
+                    code = int(digits, 16)
+                    surrogates = surrogates or 0xD800 <= code <= 0xDFFF
+                    parts.append(chr(code))
+                    self.pos += 6
+                    continue
+                if self.pos + 2 + len(digits) >= len(text) and set(digits) <= HEX_DIGITS:
+                    self.pos = len(text)
+                    continue
+            if escape in ESCAPES:
+                parts.append(ESCAPES[escape])
+            else:
+                self.repair("kept invalid escape")
+                parts.append(escape)
+            self.pos += 2
+        value = "".join(parts)
+        if surrogates:
+            value = value.encode('utf-16', 'surrogatepass').decode('utf-16', 'replace')
+        return value
+    def parse_object(self):
+        self.pos += 1
+        result = {}
+        after_comma = False
+        while True:
+            char = self._peek()
+            if not char:
+                self.repair("closed unterminated object")
+                return result
+            if char in '}]':
+                if after_comma:
+                    self.repair("removed trailing comma")
+                if char == ']':
+                    self.repair("inserted missing '}'")
+                    return result
+                self.pos += 1
+                return result
+            if char == ',':
+                self.repair("removed stray comma")
+                self.pos += 1
+                continue
+            if char in ('"', "'"):
+                key = self.parse_string()
+            else:
+                match = BARE_WORD.match(self.text, self.pos)
+                if not match:
+                    raise ValueError(f"Expected property name at position {self.pos}")
+                key = match.group()
+                self.pos = match.end()
+                self.repair("quoted bare key")
+            if self.eof or self._peek() != ':':
+                if self.eof:
+                    self.repair("dropped incomplete trailing key")
+                    self.repair("closed unterminated object")
+                    return result
+                raise ValueError(f"Expected ':' at position {self.pos}")
+            self.pos += 1
+            try:
+                result[key] = self.parse_value()
+            except Truncated:
+                self.repair("dropped incomplete trailing value")
+                self.repair("closed unterminated object")
+                return result
+            after_comma = self._separator()
+    def parse_array(self):
+        self.pos += 1
+        result = []
+        after_comma = False
+        while True:
+            char = self._peek()
+            if not char:
+                self.repair("closed unterminated array")
+                return result
+            if char in '}]':
+                if after_comma:
+                    self.repair("removed trailing comma")
+                if char == '}':
+                    self.repair("inserted missing ']'")
+                    return result
+                self.pos += 1
+                return result
+            if char == ',':
+                self.repair("removed stray comma")
+                self.pos += 1
+                continue
+            try:
+                value = self.parse_value()
+                if self.eof and isinstance(value, str):
+                    raise Truncated()
+                result.append(value)
+            except Truncated:
+                self.repair("dropped incomplete trailing value")
+                self.repair("closed unterminated array")
+                return result
+            after_comma = self._separator()
+    def _separator(self):
+        char = self._peek()
+        if char == ',':
+            self.pos += 1
+            return True
+        if char and char not in '}]':
+            self.repair("inserted missing comma")
+        return False
+def is_truncated(repairs):
+    return any(repair.startswith(TRUNCATION_REPAIRS) for repair in repairs)
+def strip_wrappers(content):
+    return REASONING.sub('', FENCES.sub('', content)).strip()
+def repair_json(text):
+    start = text.find('{')
+    if start == -1:
+        raise json.JSONDecodeError("No JSON found", text, 0)
+    try:
+        return DECODER.raw_decode(text, start)[0], []
+    except json.JSONDecodeError:
+        pass
+    repairer = JsonRepairer(text, start)
+    try:
+        value = repairer.parse()
+    except Truncated:
+        raise json.JSONDecodeError("Truncated JSON", text, repairer.pos)
+    except ValueError as e:
+        raise json.JSONDecodeError(str(e), text, repairer.pos)
+    return value, repairer.repairs
@@ -0,0 +1,24 @@
+import threading
+from collections import deque
+class LatencyHistogram:
+    def __init__(self, window=256):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+    def percentile(self, pct):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+    def snapshot(self):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {'count': 0}
+        pick = lambda pct: round(samples[min(len(samples) - 1, int(len(samples) * pct / 100))], 3)
+        return {'count': len(samples), 'p50': pick(50), 'p90': pick(90), 'p99': pick(99), 'max': round(samples[-1], 3)}
+    def __len__(self):
+        return len(self._samples)
@@ -0,0 +1,117 @@
+import io
+import math
+import multiprocessing
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import pdfplumber
+from PyPDF2 import PdfReader
+from src.config import config
+GARBLED_PATTERN = re.compile(r"\(cid:\d+\)|\ufffd|[\x00-\x08\x0b\x0c\x0e-\x1f]")
+WORD_PATTERN = re.compile(r"\S+")
+class PyPdfEngine:
+    name = "pypdf2"
+    def page_count(self, source):
+        return len(PdfReader(source).pages)
+    def extract_pages(self, source, start=0, stop=None):
+        pages = PdfReader(source).pages
+        return [page.extract_text() or "" for page in pages[start:stop]]
+class PdfPlumberEngine:
+    name = "pdfplumber"
+    def page_count(self, source):
+        with pdfplumber.open(source) as pdf:
+            return len(pdf.pages)
+    def extract_pages(self, source, start=0, stop=None):
+        with pdfplumber.open(source) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages[start:stop]]
+ENGINES = {engine.name: engine for engine in (PyPdfEngine(), PdfPlumberEngine())}
+def rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+def read_bytes(source):
+    if hasattr(source, "read"):
+        rewind(source)
+        return source.read()
+    with open(source, "rb") as f:
+        return f.read()
+def extract_page_range(engine_name, data, start, stop):
+    return ENGINES[engine_name].extract_pages(io.BytesIO(data), start, stop)
+def join_pages(pages):
+    return "\f".join(page for page in pages if page).strip()
+def text_quality_ok(text, page_count):
+    if len(text) < config.PDF_MIN_CHARS_PER_PAGE * max(page_count, 1):
+        return False
+    if len(GARBLED_PATTERN.findall(text)) > len(text) * config.PDF_MAX_GARBLED_RATIO:
+        return False
+    words = WORD_PATTERN.findall(text)
+    return bool(words) and sum(len(word) for word in words) / len(words) <= config.PDF_MAX_AVG_WORD_LENGTH
+class PdfExtractor:
+    def __init__(self, engine_names=None):
+        self.engines = [ENGINES[name] for name in (engine_names or config.PDF_ENGINES)]
+        self.parallel = config.PDF_PARALLEL_ENABLED
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+    def extract(self, source):
+        fallback = None
+        last_error = None
+        page_count = self._page_count(source)
+        if page_count and page_count > config.PDF_MAX_PAGES:
+            print(f"✂️ PDF has {page_count} pages, extracting the first {config.PDF_MAX_PAGES}")
+        for engine in self.engines:
+            try:
+                pages = self._extract_pages(engine, source, page_count)
+            except Exception as e:
+                print(f"⚠️ PDF engine {engine.name} failed: {e}")
+                last_error = e
+                continue
+            text = join_pages(pages)
+            if text_quality_ok(text, len(pages)):
+                self._record(engine.name)
+                return text, engine.name
+            print(f"⚠️ PDF engine {engine.name} produced low-quality text ({len(text)} chars, {len(pages)} pages)")
+            if fallback is None or len(text) > len(fallback[0]):
+                fallback = (text, engine.name)
+        if fallback is None:
+            raise Exception(f"PDF extraction failed: {last_error}")
+        self._record(fallback[1])
+        return fallback
+    def _page_count(self, source):
+        rewind(source)
+        try:
+            return ENGINES["pypdf2"].page_count(source)
+        except Exception:
+            return None
+    def _extract_pages(self, engine, source, page_count):
+        stop = min(page_count, config.PDF_MAX_PAGES) if page_count else config.PDF_MAX_PAGES
+        if self.parallel and page_count and stop >= config.PDF_PARALLEL_MIN_PAGES:
+            return self._extract_parallel(engine, read_bytes(source), stop)
+        rewind(source)
+        return engine.extract_pages(source, 0, stop)
+    def _extract_parallel(self, engine, data, stop):
+        pool = self._get_pool()
+        chunk = math.ceil(stop / config.PDF_PARALLEL_WORKERS)
+        futures = [pool.submit(extract_page_range, engine.name, data, start, min(start + chunk, stop)) for start in range(0, stop, chunk)]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+        return pages
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                mp_context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(max_workers=config.PDF_PARALLEL_WORKERS, mp_context=mp_context)
+                self._pool_pid = os.getpid()
+            return self._pool
+    def _record(self, engine_name):
+        with self._lock:
+            self.stats[engine_name] += 1
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+pdf_extractor = PdfExtractor()
+def disable_parallel_extraction():
+    pdf_extractor.parallel = False
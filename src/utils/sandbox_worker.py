@@ -0,0 +1,22 @@
+import sys
+from multiprocessing.connection import Connection
+from src.config import config
+from src.utils.file_handler import extract_text_from_bytes
+from src.utils.pdf_extractor import pdf_extractor
+def main(fd):
+    conn = Connection(fd)
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        file_bytes, filename, parallel = request
+        pdf_extractor.parallel = parallel and config.PDF_PARALLEL_ENABLED
+        try:
+            conn.send((True, extract_text_from_bytes(file_bytes, filename)))
+        except Exception as e:
+            conn.send((False, str(e)))
+if __name__ == '__main__':
+    main(int(sys.argv[1]))
@@ -0,0 +1,100 @@
+import json
+import threading
+class StreamingJsonParser:
+    def __init__(self, on_field=None):
+        self.on_field = on_field
+        self.reset()
+    def reset(self):
+        self.text = ""
+        self.fields = {}
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._key = None
+        self._value_start = None
+    def feed(self, chunk):
+        self.text += chunk
+        text = self.text
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._string_start is not None:
+                        self._last_string = text[self._string_start:pos + 1]
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos if self._depth == 1 else None
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 1:
+                    self._finish_value(pos)
+                self._depth = max(0, self._depth - 1)
+            elif self._depth == 1:
+                if char == ":" and self._last_string is not None:
+                    self._key = self._last_string
+                    self._value_start = pos + 1
+                elif char == ",":
+                    self._finish_value(pos)
+        self._pos = len(text)
+        return self.fields
+    def _finish_value(self, end):
+        if self._key is None or self._value_start is None:
+            return
+        try:
+            key = json.loads(self._key)
+            value = json.loads(self.text[self._value_start:end])
+        except ValueError:
+            key = None
+        self._key = None
+        self._value_start = None
+        self._last_string = None
+        if key is None or key in self.fields:
+            return
+        self.fields[key] = value
+        if self.on_field:
+            self.on_field(key, value)
+class FieldStream:
+    def __init__(self, emit=None):
+        self.emit = emit
+        self.live = None
+        self.buffers = {}
+        self._lock = threading.Lock()
+    def for_provider(self, provider):
+        if not self.emit:
+            return None
+        with self._lock:
+            self.buffers.setdefault(provider, {})
+            if self.live is None:
+                self.live = provider
+        def on_field(field, value):
+            with self._lock:
+                self.buffers[provider][field] = value
+                if provider == self.live:
+                    self.emit(field, value)
+        return on_field
+    def drop(self, provider):
+        with self._lock:
+            if self.emit and provider == self.live:
+                self._switch(next((other for other in self.buffers if other != provider), None))
+    def commit(self, provider):
+        with self._lock:
+            if self.emit and provider != self.live:
+                self._switch(provider)
+    def _switch(self, provider):
+        current = self.buffers.get(self.live, {})
+        fields = self.buffers.get(provider, {})
+        self.live = provider
+        for field in set(current) - set(fields):
+            self.emit(field, None)
+        for field, value in fields.items():
+            self.emit(field, value)
@@ -0,0 +1,111 @@
+import math
+import re
+from collections import Counter
+PAGE_BREAK = "\f"
+CHARS_PER_TOKEN = 4
+EDGE_LINES = 2
+PAGE_NUMBER_PATTERN = re.compile(r"^\s*(?:page\s*)?[-–—]?\s*\d{1,3}\s*(?:(?:of|/)\s*\d{1,3})?\s*[-–—]?\s*$", re.IGNORECASE)
+DIGITS_PATTERN = re.compile(r"\d+")
+INLINE_SPACE_PATTERN = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+BULLET_PATTERN = re.compile(r"^[•●▪■◦‣∙·\-\*o]\s+")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "career summary", "objective", "career objective", "about me", "profile summary"),
+    "experience": ("experience", "work experience", "professional experience", "employment history", "work history", "career history", "employment details"),
+    "projects": ("projects", "project experience", "erp projects", "key projects", "project details", "implementation projects", "projects handled"),
+    "skills": ("skills", "technical skills", "key skills", "core competencies", "skill set", "technical expertise", "areas of expertise", "erp skills", "functional skills"),
+    "education": ("education", "educational qualification", "educational qualifications", "academic qualification", "academic qualifications", "academics", "qualifications"),
+    "certifications": ("certifications", "certification", "certificates", "licenses and certifications", "trainings and certifications", "training"),
+    "languages": ("languages", "languages known", "language proficiency", "known languages"),
+    "personal": ("personal details", "personal information", "personal profile", "personal data"),
+    "other": ("hobbies", "interests", "hobbies and interests", "declaration", "references", "achievements", "awards", "extra curricular activities", "strengths"),
+}
+HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+HEADING_CLEAN_PATTERN = re.compile(r"[^a-z ]+")
+DROP_ORDER = ("other", "personal")
+MIN_SECTION_CHARS = 400
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+def normalize_whitespace(text):
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        lines = [INLINE_SPACE_PATTERN.sub(" ", line).strip() for line in page.split("\n")]
+        pages.append(BLANK_LINES_PATTERN.sub("\n\n", "\n".join(lines)).strip())
+    return pages
+def strip_boilerplate(pages):
+    page_lines = [page.split("\n") for page in pages]
+    edges = []
+    for lines in page_lines:
+        filled = [idx for idx, line in enumerate(lines) if line]
+        edges.append(set(filled[:EDGE_LINES] + filled[-EDGE_LINES:]))
+    counts = Counter()
+    for lines, edge in zip(page_lines, edges):
+        counts.update({DIGITS_PATTERN.sub("#", lines[idx]) for idx in edge})
+    min_pages = max(2, math.ceil(len(pages) / 2))
+    repeated = {line for line, count in counts.items() if count >= min_pages}
+    kept = []
+    seen = set()
+    removed = 0
+    for lines, edge in zip(page_lines, edges):
+        page = []
+        for idx, line in enumerate(lines):
+            if idx in edge and PAGE_NUMBER_PATTERN.match(line):
+                removed += 1
+                continue
+            key = DIGITS_PATTERN.sub("#", line)
+            if idx in edge and key in repeated:
+                if key in seen:
+                    removed += 1
+                    continue
+                seen.add(key)
+            page.append(line)
+        kept.append("\n".join(page).strip())
+    return "\n".join(page for page in kept if page), removed
+def heading_section(line):
+    if len(line) > 50:
+        return None
+    heading = HEADING_CLEAN_PATTERN.sub("", BULLET_PATTERN.sub("", line).lower().replace("&", " and "))
+    return HEADING_LOOKUP.get(" ".join(heading.split()))
+def detect_sections(text):
+    sections = [["header", []]]
+    for line in text.split("\n"):
+        section = heading_section(line)
+        if section:
+            sections.append([section, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(name, "\n".join(lines).strip()) for name, lines in sections if "\n".join(lines).strip()]
+def truncate_lines(text, max_chars):
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    return text[:cut if cut > 0 else max_chars].rstrip() + "\n[...]"
+def fit_budget(sections, token_budget):
+    max_chars = token_budget * CHARS_PER_TOKEN
+    total = sum(len(body) for _, body in sections)
+    dropped = []
+    for drop in DROP_ORDER:
+        if total <= max_chars:
+            break
+        if any(name == drop for name, _ in sections):
+            total -= sum(len(body) for name, body in sections if name == drop)
+            sections = [(name, body) for name, body in sections if name != drop]
+            dropped.append(drop)
+    if total > max_chars:
+        ratio = max_chars / total
+        sections = [(name, body if name == "header" else truncate_lines(body, max(MIN_SECTION_CHARS, int(len(body) * ratio)))) for name, body in sections]
+        dropped.append("truncated")
+    return sections, dropped
+def preprocess(text, token_budget):
+    pages = normalize_whitespace(text)
+    cleaned, boilerplate_lines = strip_boilerplate(pages)
+    sections, dropped = fit_budget(detect_sections(cleaned), token_budget)
+    prepared = "\n\n".join(body for _, body in sections)
+    return prepared, {
+        "original_tokens": estimate_tokens(text),
+        "tokens": estimate_tokens(prepared),
+        "boilerplate_lines": boilerplate_lines,
+        "sections": [name for name, _ in sections],
+        "trimmed": dropped,
+    }
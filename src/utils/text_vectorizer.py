@@ -0,0 +1,74 @@
+import math
+import re
+import zlib
+import numpy as np
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#/.]*")
+FIELD_WEIGHTS = {
+    'current_role': 2.0,
+    'erp_systems': 2.0,
+    'erp_modules': 2.0,
+    'technical_skills': 1.5,
+    'certifications': 1.0,
+    'name': 1.0,
+    'summary': 1.0,
+    'location': 1.0,
+    'total_years_experience': 1.0,
+    'current_company': 0.5
+}
+class HashingVectorizer:
+    def __init__(self, dim=1024):
+        self.dim = dim
+    @staticmethod
+    def tokenize(text):
+        return [token.rstrip('.') for token in TOKEN_PATTERN.findall((text or '').lower())]
+    def _features(self, text, weight, counts):
+        tokens = self.tokenize(text)
+        for idx, token in enumerate(tokens):
+            counts[token] = counts.get(token, 0.0) + weight
+            if idx + 1 < len(tokens):
+                bigram = f"{token} {tokens[idx + 1]}"
+                counts[bigram] = counts.get(bigram, 0.0) + weight
+            padded = f"#{token}#"
+            for start in range(len(padded) - 2):
+                gram = f"~{padded[start:start + 3]}"
+                counts[gram] = counts.get(gram, 0.0) + weight * 0.25
+    def transform(self, text):
+        return self.transform_fields({'text': text}, {'text': 1.0})
+    def transform_fields(self, fields, weights=None):
+        weights = weights or FIELD_WEIGHTS
+        counts = {}
+        for field, text in fields.items():
+            if text:
+                self._features(text, weights.get(field, 1.0), counts)
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in counts.items():
+            digest = zlib.crc32(feature.encode('utf-8'))
+            sign = 1.0 if (digest >> 31) & 1 else -1.0
+            vector[digest % self.dim] += sign * (1.0 + math.log(count)) if count >= 1 else sign * count
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+    def to_bytes(self, vector):
+        return vector.astype(np.float32).tobytes()
+    def from_bytes(self, data):
+        if data is None or len(data) != self.dim * 4:
+            return None
+        return np.frombuffer(bytes(data), dtype=np.float32)
+    @staticmethod
+    def resume_fields(parsed_data):
+        def join(value):
+            return ', '.join(value) if isinstance(value, list) else (value or '')
+        years = parsed_data.get('total_years_experience', '')
+        return {
+            'name': parsed_data.get('name', ''),
+            'current_role': parsed_data.get('current_role', ''),
+            'current_company': parsed_data.get('current_company', ''),
+            'location': parsed_data.get('location', ''),
+            'summary': parsed_data.get('summary', ''),
+            'erp_systems': join(parsed_data.get('erp_systems')),
+            'erp_modules': join(parsed_data.get('erp_modules')),
+            'technical_skills': join(parsed_data.get('technical_skills')),
+            'certifications': join(parsed_data.get('certifications')),
+            'total_years_experience': f"{years} years experience" if years else ''
+        }